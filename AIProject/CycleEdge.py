@@ -1,137 +1,249 @@
-def find_cycle_edge():
+from collections import deque
+
+import numpy as np
+
+from InputLoader import iter_array, open_input, read_line
+from leetcode import DSU
+
+# 分块读取边时每块的字节数，块越小找到环路后多读的输入越少
+EDGE_CHUNK_SIZE = 1 << 20
+
+
+def read_edges(lines):
+    """
+    从文本行中逐条解析边，每行两个以空白分隔的节点编号
+
+    Args:
+        lines: 可迭代的文本行，例如打开的文件对象或生成器
+
+    Yields:
+        tuple: 边的两个端点(u, v)
+    """
+    for line in lines:
+        parts = line.split()
+        if parts:
+            yield int(parts[0]), int(parts[1])
+
+
+def iter_edges(stream, n, chunk_size=EDGE_CHUNK_SIZE):
+    """
+    从二进制输入流中分块读取n条边，逐条产出端点
+
+    每块解析为整数数组后再转成元组，一条边的两个端点可能被块边界切开，
+    落单的端点留到下一块再配对。
+
+    Args:
+        stream: 二进制输入流
+        n (int): 边数
+        chunk_size (int): 每次读取的字节数
+
+    Yields:
+        tuple: 边的两个端点(u, v)
+    """
+    carry = []
+    for part in iter_array(stream, 2 * n, np.int64, chunk_size):
+        values = carry + part.tolist()
+        even = len(values) - len(values) % 2
+        yield from zip(values[0:even:2], values[1:even:2])
+        carry = values[even:]
+
+
+def find_redundant_edge(edges):
     """
     查找图中形成环路的最后一条边
-    
-    该函数读取图的边信息，构建图结构，使用深度优先搜索(DFS)检测环路，
-    并找出形成环路的最后一条边并输出。
-    
+
+    按输入顺序用并查集合并每条边的两个端点，第一条两端已经连通的边就是使环路闭合的边，
+    对于恰好含有一个环的图，它正是环上按输入顺序最靠后的那条边。
+    只扫描一遍边，不保存边列表和邻接表，也不使用递归，节点编号可以是任意可哈希的值，
+    内部会压缩映射为连续的整数。
+
+    Args:
+        edges: 可迭代的边(u, v)，例如列表、生成器或 read_edges(文件对象)
+
     Returns:
-        None: 直接打印结果，无返回值
+        tuple: 形成环路的边(u, v)，图中没有环路时返回None
     """
-    # 读取边数
-    # 从标准输入读取图中的边数n
-    n = int(input().strip())
-
-    # 存储所有边的列表
-    # 用于保存输入的所有边，按输入顺序存储
-    edges = []
-
-    # 图的邻接表表示
-    # 使用字典存储图结构，键为节点，值为邻接节点列表
-    graph = {}
-
-    # 读取所有边并构建图
-    # 循环n次读取所有边信息
-    for i in range(n):
-        # 读取一条边的两个端点u和v
-        u, v = map(int, input().strip().split())
-        # 将边添加到边列表中
-        edges.append((u, v))
-
-        # 初始化节点的邻接表
-        # 如果节点u不在图中，创建其邻接表
-        if u not in graph:
-            graph[u] = []
-        # 如果节点v不在图中，创建其邻接表
-        if v not in graph:
-            graph[v] = []
-
-        # 添加无向边，同时记录边的索引
-        # 在无向图中，每条边需要在两个方向都添加
-        # 同时记录边在输入中的索引i，用于后续识别具体是哪条边
-        graph[u].append((v, i))
-        graph[v].append((u, i))
-
-    # DFS访问标记数组
-    # 用于标记节点是否已被访问，避免重复访问
-    visited = [False] * (n + 2)
-
-    # 父节点记录数组
-    # 记录每个节点在DFS过程中的父节点，用于避免将父节点误判为环路
-    parent = [-1] * (n + 2)
-
-    # 存储环路中边的索引集合
-    # 使用集合存储构成环路的边的索引
-    edge_index_in_cycle = set()
-
-    # 环路入口节点
-    # 记录检测到的环路入口节点
-    entry_node = -1
-
-    def dfs(u, p):
+    # 节点编号到并查集下标的紧凑映射
+    index = {}
+    dsu = DSU(0)
+    for u, v in edges:
+        a = index.get(u)
+        if a is None:
+            a = index[u] = dsu.add()
+        b = index.get(v)
+        if b is None:
+            b = index[v] = dsu.add()
+        # 两个端点已经连通，这条边使环路闭合
+        if not dsu.unite(a, b):
+            return u, v
+    return None
+
+
+class CycleTracker:
+    """
+    在线检测环路：逐条加入边，立即判断新边是否闭合环路并给出环上的所有边
+
+    并查集回答两个端点是否已经连通；同时维护一棵生成森林，记录每个节点的父节点、
+    深度和连向父节点的边。新边连接两棵不同的树时，把较小的树以新边端点为根重新挂到
+    较大的树上（启发式合并，总代价O(n log n)）；新边两端已连通时，
+    沿父指针从两端向上走到最近公共祖先，得到环上的树边。
+
+    属性:
+        index (dict): 节点编号到内部下标的映射
+        dsu (DSU): 连通性并查集
+    """
+
+    def __init__(self):
+        self.index = {}
+        self.dsu = DSU(0)
+        # 生成森林：父节点下标（根为-1）、深度、连向父节点的原始边、森林中的邻接表
+        self.parent = []
+        self.depth = []
+        self.parent_edge = []
+        self.tree_adj = []
+
+    def _node(self, u):
+        """
+        获取节点的内部下标，新节点单独成为一棵树
+
+        Args:
+            u: 节点编号
+
+        Returns:
+            int: 内部下标
         """
-        深度优先搜索检测环路
+        i = self.index.get(u)
+        if i is None:
+            i = self.index[u] = self.dsu.add()
+            self.parent.append(-1)
+            self.depth.append(0)
+            self.parent_edge.append(None)
+            self.tree_adj.append([])
+        return i
+
+    def _hang(self, root, parent, edge):
+        """
+        以root为根重新计算其所在树中每个节点的父节点和深度，并把root挂到parent下
 
         Args:
-            u: 当前访问的节点
-            p: 父节点
+            root (int): 新的根节点下标
+            parent (int): root的新父节点下标，-1表示root成为整棵树的根
+            edge (tuple): root连向parent的原始边
+        """
+        self.parent[root] = parent
+        self.parent_edge[root] = edge
+        self.depth[root] = self.depth[parent] + 1 if parent >= 0 else 0
+        queue = deque([root])
+        while queue:
+            x = queue.popleft()
+            for y, e in self.tree_adj[x]:
+                if y != self.parent[x]:
+                    self.parent[y] = x
+                    self.parent_edge[y] = e
+                    self.depth[y] = self.depth[x] + 1
+                    queue.append(y)
+
+    def _path(self, a, b):
+        """
+        沿生成森林中的父指针找出从a到b的路径上的边
+
+        Args:
+            a (int): 起点下标
+            b (int): 终点下标，必须与a连通
 
         Returns:
-            int: 如果找到环路返回入口节点，否则返回-1
+            list: 路径上按从a到b顺序排列的原始边
+        """
+        head, tail = [], []
+        while self.depth[a] > self.depth[b]:
+            head.append(self.parent_edge[a])
+            a = self.parent[a]
+        while self.depth[b] > self.depth[a]:
+            tail.append(self.parent_edge[b])
+            b = self.parent[b]
+        while a != b:
+            head.append(self.parent_edge[a])
+            tail.append(self.parent_edge[b])
+            a, b = self.parent[a], self.parent[b]
+        return head + tail[::-1]
+
+    def add_edge(self, u, v):
         """
-        # 声明使用外层函数的entry_node变量
-        nonlocal entry_node
-
-        # 标记当前节点已访问
-        # 将当前节点u标记为已访问，避免重复访问
-        visited[u] = True
-
-        # 遍历当前节点的所有邻接节点
-        # 遍历节点u的所有邻接节点及其对应的边索引
-        for v, idx in graph[u]:
-            # 跳过父节点
-            # 避免将父节点误判为环路（因为是无向图）
-            if v == p:
-                continue
-
-            # 如果邻接节点已访问，说明找到环路
-            # 在DFS过程中遇到已访问的节点，说明存在环路
-            if visited[v]:
-                # 记录环路入口节点
-                entry_node = v
-                # 将构成环路的边索引添加到集合中
-                edge_index_in_cycle.add(idx)
-                # 返回当前节点，表示找到了环路
-                return u
+        加入一条无向边
+
+        Args:
+            u: 第一个端点
+            v: 第二个端点
+
+        Returns:
+            list: 新边闭合了环路时，返回环上的所有边（生成森林中u到v的路径加上新边本身）；
+                否则返回None
+        """
+        a, b = self._node(u), self._node(v)
+        edge = (u, v)
+        ra, rb = self.dsu.find(a), self.dsu.find(b)
+        if ra == rb:
+            return self._path(a, b) + [edge]
+        # 较小的树以自己的端点为根，挂到较大的树上
+        if -self.dsu.p[ra] > -self.dsu.p[rb]:
+            a, b = b, a
+        self.tree_adj[a].append((b, edge))
+        self.tree_adj[b].append((a, edge))
+        self._hang(a, b, edge)
+        self.dsu.unite(a, b)
+        return None
+
+    def bulk_load(self, edges):
+        """
+        批量加入初始图的边
+
+        先只用并查集划分树边与闭合环路的边，最后对每棵受影响的树做一次BFS重建父指针和深度，
+        总代价与边数成线性关系。
+
+        Args:
+            edges: 可迭代的边(u, v)
+
+        Returns:
+            list: 加入时闭合了环路的边，按输入顺序排列
+        """
+        closing = []
+        touched = []
+        for u, v in edges:
+            a, b = self._node(u), self._node(v)
+            edge = (u, v)
+            if self.dsu.unite(a, b):
+                self.tree_adj[a].append((b, edge))
+                self.tree_adj[b].append((a, edge))
+                touched.append(a)
             else:
-                # 设置父节点并递归访问
-                # 设置节点v的父节点为u
-                parent[v] = u
-                # 递归访问节点v
-                res = dfs(v, u)
-
-                # 如果子节点找到了环路
-                if res != -1:
-                    # 将当前边添加到环路边集合中
-                    edge_index_in_cycle.add(idx)
-
-                    # 如果回到起始节点，结束搜索
-                    # 当返回的节点等于当前节点时，说明环路已完整找到
-                    if res == u:
-                        return -1
-                    # 否则继续向上传递环路信息
-                    return res
-
-        # 如果没有找到环路，返回-1
-        return -1
-
-    # 对所有节点进行DFS搜索
-    # 遍历所有可能的节点，确保能检测到所有连通分量中的环路
-    for i in range(1, n + 1):
-        # 如果节点未被访问过，则从该节点开始DFS
-        if not visited[i]:
-            # 如果DFS找到了环路，则停止搜索
-            if dfs(i, -1) != -1:
-                break
-
-    # 从后往前查找第一条在环路中的边并输出
-    # 按输入顺序从后往前查找，找到第一条构成环路的边
-    for i in range(n - 1, -1, -1):
-        # 如果边索引在环路边集合中
-        if i in edge_index_in_cycle:
-            # 获取边的两个端点
-            u, v = edges[i]
-            # 输出这条边
-            print(f"{u} {v}")
-            # 结束函数
-            return
+                closing.append(edge)
+        # 每棵受影响的树只重建一次
+        done = set()
+        for a in touched:
+            root = self.dsu.find(a)
+            if root not in done:
+                done.add(root)
+                self._hang(a, -1, None)
+        return closing
+
+
+def find_cycle_edge():
+    """
+    查找图中形成环路的最后一条边
+
+    从标准输入读取边数n和n条边，输出形成环路的最后一条边。
+
+    Returns:
+        None: 直接打印结果，无返回值
+    """
+    stream = open_input()
+    # 读取边数
+    # 从标准输入读取图中的边数n
+    n = int(read_line(stream, np.int64)[0])
+
+    # 分块读取边的端点并逐条交给并查集，找到环路后不再读取剩余的边
+    edge = find_redundant_edge(iter_edges(stream, n))
+    if edge is not None:
+        u, v = edge
+        # 输出这条边
+        print(f"{u} {v}")
@@ -1,4 +1,7 @@
-from openpyxl.styles.builtins import output
+import threading  # 参数服务器模式的工作线程和锁
+import time  # 统计吞吐量
+
+import numpy as np
 
 
 def cal_grad(x, y):
@@ -6,11 +9,11 @@ def cal_grad(x, y):
     计算函数在点(x,y)处的梯度
 
     Args:
-        x: 函数自变量x的值
-        y: 函数自变量y的值
+        x: 函数自变量x的值，可以是标量或ndarray
+        y: 函数自变量y的值，与x同形状
 
     Returns:
-        tuple: 包含x方向和y方向偏导数的元组
+        tuple: 包含x方向和y方向偏导数的元组，输入为数组时按元素计算
     """
     # 计算x方向的偏导数
     # 函数形式为: f(x,y) = x*y^3 + 2*x^2*y + x*y + y^2 + x + y
@@ -26,11 +29,11 @@ def get_grad_down(gx, gy, wx, wy, A):
     根据梯度和学习率更新模型权重
 
     Args:
-        gx: x方向的梯度值
+        gx: x方向的梯度值，可以是标量或ndarray
         gy: y方向的梯度值
         wx: 当前x方向的权重
         wy: 当前y方向的权重
-        A: 学习率参数
+        A: 学习率参数，标量或与权重同形状的数组
 
     Returns:
         tuple: 更新后的x和y方向权重
@@ -44,7 +47,62 @@ def get_grad_down(gx, gy, wx, wy, A):
     return wx_, wy_
 
 
-def process(init_value, async_order, learning_rate):
+def _process_batch(init_value, async_order, learning_rate, tol=None):
+    """
+    对多组初始点和学习率同时执行异步梯度下降
+
+    每条轨迹的计算过程与 process 的单点版本相同。指定tol时，
+    某条轨迹的更新步长小于tol（或权重已发散为非有限值）后不再更新，后续只计算仍活跃的轨迹。
+
+    初始点和学习率按广播规则对齐，单个初始点配合一组学习率即为学习率扫描。
+
+    Args:
+        init_value: 初始权重，形状为(2,)、(1, 2)或(T, 2)
+        async_order: 异步工作节点顺序列表
+        learning_rate: 学习率，标量、形状为(1,)或(T,)
+        tol: 收敛阈值，为None时每条轨迹都跑完全部更新
+
+    Returns:
+        np.ndarray: 最终权重，形状为(T, 2)
+
+    Examples:
+        >>> sweep = process([0.1, 0.2], [1, 2, 1], [0.01, 0.02])
+        >>> sweep.shape
+        (2, 2)
+        >>> np.allclose(sweep[1], process([0.1, 0.2], [1, 2, 1], 0.02))
+        0.083 0.110
+        True
+        >>> process([[0.1, 0.2]], [1, 2, 1], np.array([0.01, 0.02])).shape
+        (2, 2)
+    """
+    weights = np.array(init_value, dtype=np.float64).reshape(-1, 2)
+    lr = np.asarray(learning_rate, dtype=np.float64).reshape(-1)
+    # 初始点个数和学习率个数广播到相同的轨迹数T
+    T = np.broadcast_shapes((len(weights),), lr.shape)[0]
+    weights = np.broadcast_to(weights, (T, 2)).copy()
+    lr = np.broadcast_to(lr, (T,))
+    # 每个工作节点保存各轨迹上次拿到的权重
+    grad_d = {w: weights.copy() for w in async_order}
+    active = np.arange(len(weights))
+
+    for worker in async_order:
+        if len(active) == 0:
+            break
+        stored = grad_d[worker]
+        gx, gy = cal_grad(stored[active, 0], stored[active, 1])
+        wx, wy = get_grad_down(gx, gy, weights[active, 0], weights[active, 1], lr[active])
+        if tol is not None:
+            step = np.maximum(np.abs(wx - weights[active, 0]), np.abs(wy - weights[active, 1]))
+        weights[active, 0], weights[active, 1] = wx, wy
+        stored[active] = weights[active]
+        if tol is not None:
+            # 已收敛或发散的轨迹移出活跃集合
+            done = ~(step >= tol) | ~np.isfinite(wx) | ~np.isfinite(wy)
+            active = active[~done]
+    return weights
+
+
+def process(init_value, async_order, learning_rate, tol=None):
     """
     执行异步梯度下降算法
 
@@ -57,13 +115,17 @@ def process(init_value, async_order, learning_rate):
         最终输出优化后的权重值
 
     Args:
-        init_value: 初始权重值[x, y]
+        init_value: 初始权重值[x, y]，或形状为(T, 2)的多个初始点
         async_order: 异步工作节点顺序列表
-        learning_rate: 学习率参数
+        learning_rate: 学习率参数，多个初始点时可以是形状为(T,)的数组
+        tol: 多个初始点时的收敛阈值，见 _process_batch
 
     Returns:
-        list: 最终的权重值[x, y]
+        list: 最终的权重值[x, y]；多个初始点时返回形状为(T, 2)的ndarray，不打印
     """
+    if np.ndim(init_value) == 2 or np.ndim(learning_rate) > 0:
+        return _process_batch(init_value, async_order, learning_rate, tol)
+
     # 初始化各工作节点的梯度值，为每个工作节点分配初始权重值
     # 创建一个字典，键为工作节点标识，值为初始权重值
     grad_d = {}
@@ -104,5 +166,144 @@ def process(init_value, async_order, learning_rate):
     return output
 
 
+class ShardedStore:
+    """
+    分片参数存储：权重向量按维度切成若干分片，每个分片有独立的锁和版本号，
+    不同工作线程推送更新时只在同一分片上互斥。
+    分片的版本号与权重在同一把锁内读写，拉取到的每个分片副本都对应确定的版本。
+    """
+
+    def __init__(self, init_value, n_shards=1):
+        """
+        初始化参数存储
+
+        Args:
+            init_value: 初始权重向量
+            n_shards: 分片数，不超过权重维度
+        """
+        self.weights = np.array(init_value, dtype=np.float64)
+        bounds = np.linspace(0, len(self.weights), min(n_shards, len(self.weights)) + 1).astype(int)
+        self.shards = list(zip(bounds[:-1], bounds[1:]))
+        self.locks = [threading.Lock() for _ in self.shards]
+        # 每个分片的版本号：已经应用到该分片的更新次数
+        self.versions = np.zeros(len(self.shards), dtype=np.int64)
+        # 已经完成的更新总次数
+        self.version = 0
+        self._version_lock = threading.Lock()
+
+    def pull(self):
+        """
+        拉取当前权重的副本，各分片分别加锁读取
+
+        Returns:
+            tuple: (权重副本, 各分片副本对应的版本号)
+        """
+        w = np.empty_like(self.weights)
+        versions = np.empty_like(self.versions)
+        for j, ((lo, hi), lock) in enumerate(zip(self.shards, self.locks)):
+            with lock:
+                w[lo:hi] = self.weights[lo:hi]
+                versions[j] = self.versions[j]
+        return w, versions
+
+    def push(self, grad, learning_rate):
+        """
+        按分片把梯度更新应用到权重上
+
+        Args:
+            grad: 梯度向量
+            learning_rate: 学习率
+
+        Returns:
+            np.ndarray: 本次更新应用到各分片之前的版本号
+        """
+        versions = np.empty_like(self.versions)
+        for j, ((lo, hi), lock) in enumerate(zip(self.shards, self.locks)):
+            with lock:
+                self.weights[lo:hi] -= learning_rate * grad[lo:hi]
+                versions[j] = self.versions[j]
+                self.versions[j] += 1
+        with self._version_lock:
+            self.version += 1
+        return versions
+
+
+def parameter_server(init_value, learning_rate, n_workers=4, steps=100, grad_fn=None,
+                     staleness=2, n_shards=None):
+    """
+    多线程参数服务器模式的异步梯度下降
+
+    每个工作线程循环执行：从参数存储拉取（可能已过期的）权重，计算梯度，推送更新。
+    使用有界延迟同步（SSP）：任一工作线程的迭代计数最多领先最慢的线程staleness轮，
+    staleness=0时退化为逐轮同步。
+
+    Args:
+        init_value: 初始权重向量
+        learning_rate: 学习率
+        n_workers: 工作线程数
+        steps: 每个工作线程的迭代次数
+        grad_fn: 梯度函数，输入权重ndarray，返回同形状的梯度；为None时使用 cal_grad 的二元函数
+        staleness: 允许领先最慢线程的最大轮数
+        n_shards: 参数分片数，为None时取min(维度, n_workers)，每个分片一把锁
+
+    Returns:
+        tuple: (最终权重列表, 统计信息字典)
+            统计信息包括总更新次数updates、耗时seconds、吞吐量throughput（次/秒），
+            以及延迟的平均值staleness_mean和最大值staleness_max，
+            延迟为一次更新计算梯度所用的各分片副本与应用时相差的更新次数（取各分片的最大值）
+
+    Raises:
+        Exception: 某个工作线程中grad_fn抛出的异常，在所有线程结束后重新抛出
+    """
+    if grad_fn is None:
+        grad_fn = lambda w: np.array(cal_grad(w[0], w[1]))
+    store = ShardedStore(init_value, n_shards or min(len(init_value), n_workers))
+    clocks = [0] * n_workers
+    cond = threading.Condition()
+    delays = [[] for _ in range(n_workers)]
+    errors = []
+
+    def worker(i):
+        try:
+            for step in range(steps):
+                # 等待直到领先最慢的线程不超过staleness轮
+                with cond:
+                    cond.wait_for(lambda: step - min(clocks) <= staleness)
+                w, pulled = store.pull()
+                applied = store.push(np.asarray(grad_fn(w), dtype=np.float64), learning_rate)
+                delays[i].append(int((applied - pulled).max()))
+                with cond:
+                    clocks[i] = step + 1
+                    cond.notify_all()
+        except Exception as e:
+            # 记录异常，等所有线程结束后在主线程中重新抛出
+            errors.append(e)
+        finally:
+            # 出错时把时钟推到终点，避免其他线程一直等待
+            with cond:
+                clocks[i] = steps
+                cond.notify_all()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_workers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    seconds = time.perf_counter() - start
+    if errors:
+        raise errors[0]
+
+    delays = np.concatenate([np.asarray(d, dtype=np.int64) for d in delays])
+    metrics = {
+        'updates': store.version,
+        'seconds': seconds,
+        'throughput': store.version / seconds if seconds > 0 else float('inf'),
+        'staleness_mean': float(delays.mean()) if len(delays) else 0.0,
+        'staleness_max': int(delays.max()) if len(delays) else 0,
+    }
+    return store.weights.tolist(), metrics
+
+
 if __name__ == "__main__":
     process()
@@ -1,5 +1,20 @@
+import os  # 获取CPU核数
+from concurrent.futures import ProcessPoolExecutor  # 多进程并行训练和预测
+from multiprocessing import shared_memory  # 进程间共享训练数据，避免序列化
+
 import numpy as np
 
+from InputLoader import open_input, read_line, read_matrix
+
+# 统计计数张量时每块处理的元素个数上限（行数×特征数，以及特征数×取值数×类别数）
+BLOCK_SIZE = 1 << 22
+
+# 支持的划分准则：ID3使用信息增益，C4.5使用信息增益率
+CRITERIA = ('id3', 'c45')
+
+# 工作进程中挂载的共享内存、数据视图和树
+_SHARED = {}
+
 
 def input_data():
     """
@@ -8,12 +23,85 @@ def input_data():
     Returns:
         np.ndarray: 用户输入的数据，转换为numpy数组格式
     """
-    n = int(input())
-    data = []
-    # 读取n行数据并转换为整数列表
-    for _ in range(n):
-        data.append(list(map(int, input().strip().split())))
-    return np.array(data)
+    stream = open_input()
+    n = int(read_line(stream, np.int64)[0])
+    # 整块读取n行数据并解析为整数矩阵
+    return read_matrix(stream, n, np.int64)
+
+
+def _encode(values):
+    """
+    把一列离散取值转换为从0开始的整数编码
+
+    Args:
+        values (np.ndarray): 一列取值
+
+    Returns:
+        tuple: (编码数组, 排序后的不同取值)；取值已经是 0..k-1 的非负整数且每个值都出现过时
+            直接使用原数组，第二项为None
+    """
+    if np.issubdtype(values.dtype, np.integer) and (len(values) == 0 or values.min() >= 0):
+        top = int(values.max()) + 1 if len(values) else 0
+        if top <= len(values):
+            # 取值范围不超过行数时用计数表在线性时间内压缩掉没有出现的取值
+            present = np.bincount(values, minlength=top) > 0
+            if present.all():
+                return values, None
+            lookup = np.cumsum(present) - 1
+            return lookup[values], np.flatnonzero(present)
+    uniques, codes = np.unique(values, return_inverse=True)
+    return codes.reshape(values.shape), uniques
+
+
+def _traverse(codes, feature, keys, children, width, klass):
+    """
+    批量沿树向下走，所有样本同时每轮前进一层
+
+    遇到该节点没有对应子节点的取值时停在当前节点，使用节点的多数类别。
+
+    Args:
+        codes (np.ndarray): 样本的特征编码，形状为(n, 特征数)，无效取值为-1
+        feature (np.ndarray): 各节点的划分特征，叶子为-1
+        keys (np.ndarray): 所有父子边按 节点编号 * width + 取值编码 升序排列的键
+        children (np.ndarray): 与keys一一对应的子节点编号
+        width (int): 计算键时使用的取值编码上界
+        klass (np.ndarray): 各节点的多数类别编码
+
+    Returns:
+        np.ndarray: 每个样本的类别编码，形状为(n,)
+    """
+    node = np.zeros(len(codes), dtype=np.int64)
+    active = np.arange(len(codes))
+    while len(active):
+        split = feature[node[active]]
+        active = active[split >= 0]
+        split = split[split >= 0]
+        value = codes[active, split]
+        child = np.full(len(active), -1, dtype=np.int64)
+        valid = np.flatnonzero((value >= 0) & (value < width))
+        if len(keys) and len(valid):
+            # 在有序的边键中二分查找 (节点, 取值) 对应的子节点
+            key = node[active[valid]] * width + value[valid]
+            at = np.minimum(np.searchsorted(keys, key), len(keys) - 1)
+            found = keys[at] == key
+            child[valid[found]] = children[at[found]]
+        active = active[child >= 0]
+        node[active] = child[child >= 0]
+    return klass[node]
+
+
+def _xlogx(counts):
+    """
+    逐元素计算 n * log2(n)，约定 0 * log2(0) = 0
+
+    Args:
+        counts (np.ndarray): 计数数组
+
+    Returns:
+        np.ndarray: 与counts同形状的结果
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    return counts * np.log2(np.where(counts > 0, counts, 1))
 
 
 class DecisionTree:
@@ -26,6 +114,20 @@ class DecisionTree:
 
     def __init__(self, matrix):
         self.matrix = matrix
+        features = matrix[:, :-1]
+        # 特征和标签的整数编码，编码个数等于不同取值的个数；
+        # 所有特征都已经是连续的非负整数编码时直接使用原矩阵的视图，不复制数据
+        encoded = [_encode(features[:, i]) for i in range(features.shape[1])]
+        self.values = [u for _, u in encoded]
+        if all(u is None for u in self.values):
+            self.codes = features
+        else:
+            self.codes = np.stack([c for c, _ in encoded], axis=1)
+        self.labels, self.classes = _encode(matrix[:, -1])
+        self.n_classes = int(self.labels.max()) + 1 if len(self.labels) else 0
+        # 每个特征的取值个数（编码的上界）
+        self.n_values = (self.codes.max(axis=0).astype(np.int64) + 1 if len(self.codes)
+                         else np.zeros(self.codes.shape[1], dtype=np.int64))
 
     def get_entropy(self, input_matrix):
         """
@@ -46,6 +148,79 @@ class DecisionTree:
         entropy = -np.sum(no_zero_prob * np.log2(no_zero_prob))
         return entropy if entropy else 0
 
+    def class_counts(self, rows=None):
+        """
+        统计各类别的样本数
+
+        Args:
+            rows (np.ndarray): 参与统计的行下标，为None时使用全部行
+
+        Returns:
+            np.ndarray: 形状为(n_classes,)的计数
+        """
+        labels = self.labels if rows is None else self.labels[rows]
+        return np.bincount(labels, minlength=self.n_classes)
+
+    def count_tensor(self, rows=None, features=None):
+        """
+        统计(特征, 取值, 类别)三维计数张量
+
+        把特征序号、取值编码和类别编码组合成一个整数，按特征分块对组合编码做一次 np.bincount，
+        不按取值复制数据子集。
+
+        Args:
+            rows (np.ndarray): 参与统计的行下标，为None时使用全部行
+            features (np.ndarray): 参与统计的特征下标，为None时使用全部特征
+
+        Returns:
+            np.ndarray: 形状为(特征数, 最大取值个数, n_classes)，
+                counts[f, v, c]为第f个特征取值为v且类别为c的样本数
+        """
+        features = np.arange(self.codes.shape[1]) if features is None else np.asarray(features)
+        labels = self.labels if rows is None else self.labels[rows]
+        n_rows, n_classes = len(labels), self.n_classes
+        n_values = int(self.n_values[features].max()) if len(features) else 0
+        counts = np.zeros((len(features), n_values, n_classes), dtype=np.int64)
+        if n_rows == 0 or n_values == 0:
+            return counts
+
+        cell = n_values * n_classes
+        step = max(1, min(BLOCK_SIZE // n_rows, BLOCK_SIZE // cell))
+        for start in range(0, len(features), step):
+            block = features[start:start + step]
+            codes = self.codes[:, block] if rows is None else self.codes[np.ix_(rows, block)]
+            # 组合编码：(特征在块内的序号 * 取值个数 + 取值) * 类别数 + 类别
+            combined = codes * n_classes + labels[:, None]
+            combined += np.arange(len(block)) * cell
+            counts[start:start + len(block)] = np.bincount(
+                combined.ravel(), minlength=len(block) * cell).reshape(len(block), n_values, n_classes)
+        return counts
+
+    def information_gain(self, rows=None, features=None, counts=None):
+        """
+        一次计算所有特征的多路划分信息增益
+
+        Args:
+            rows (np.ndarray): 参与计算的行下标，为None时使用全部行
+            features (np.ndarray): 参与计算的特征下标，为None时使用全部特征
+            counts (np.ndarray): 已经统计好的计数张量，为None时调用 count_tensor 统计
+
+        Returns:
+            tuple: (信息增益数组, 条件熵数组, 数据集的熵)
+        """
+        if counts is None:
+            counts = self.count_tensor(rows, features)
+        class_total = counts[0].sum(axis=0) if len(counts) else self.class_counts(rows)
+        n = class_total.sum()
+        if n == 0:
+            zeros = np.zeros(len(counts))
+            return zeros, zeros, 0.0
+        # H(D) = log2(N) - Σ n_c log2(n_c) / N
+        hd = float(np.log2(n) - _xlogx(class_total).sum() / n)
+        # H(D|A) = Σ_v n_v/N * H(D_v) = (Σ_v n_v log2(n_v) - Σ_v Σ_c n_vc log2(n_vc)) / N
+        hda = (_xlogx(counts.sum(axis=2)).sum(axis=1) - _xlogx(counts).sum(axis=(1, 2))) / n
+        return hd - hda, hda, hd
+
     def calculate_information_gain(self, hd):
         """
         计算每个特征的信息增益
@@ -56,34 +231,375 @@ class DecisionTree:
         Returns:
             list: 每个特征对应的信息增益值列表，信息增益越大表示该特征越重要
         """
-        # 计算每个特征的信息增益
-        gda = []
-        # 遍历除最后一列（标签列）外的所有特征列
-        for i in range(len(self.matrix[0]) - 1):
-            # 根据第i个特征将数据分为两类（0和1）
-            d0 = self.matrix[self.matrix[:, i] == 0]
-            d1 = self.matrix[self.matrix[:, i] == 1]
-            # 计算条件熵
-            hda = (len(d0) * self.get_entropy(d0) + len(d1) * self.get_entropy(d1)) / len(self.matrix)
-            # 计算信息增益
-            gda.append(round(hd - hda, 2))
-        return gda
-
-
-# 6
-# 1 1 0 1 1 0
-# 1 0 0 1 1 1
-# 0 1 0 0 1 1
-# 0 1 0 1 0 0
-# 0 1 0 0 0 0
-# 0 0 0 1 0 0
-# 获取输入数据并计算整体熵值
-input_matrix = input_data()
-decision_tree = DecisionTree(input_matrix)
-HD = decision_tree.get_entropy(input_matrix)
-GDA = decision_tree.calculate_information_gain(HD)
-
-# 输出信息增益最大的特征索引和对应的信息增益值
-if GDA:
-    max_entropy = max(GDA)
-    print(GDA.index(max_entropy), max_entropy)
+        # 一次统计所有特征的(取值, 类别)计数，按特征的每个取值划分计算条件熵
+        _, hda, _ = self.information_gain()
+        # 计算信息增益
+        return [round(float(hd - h), 2) for h in hda]
+
+    def fit(self, max_depth=None, min_samples_split=2, criterion='id3', rows=None, features=None,
+            max_features=None, random_state=None):
+        """
+        用ID3或C4.5算法构建多路划分的决策树
+
+        每个节点只保存行下标数组，不复制数据矩阵。节点的(特征, 取值, 类别)计数张量
+        按最优特征的取值拆分给各子节点：样本数最多的子节点用父节点减去其余子节点得到，
+        其余子节点各统计一次，所以每层总共只需扫描一遍数据
+        （子节点过多、计数张量总量超过 BLOCK_SIZE 时，其余子节点出栈后再统计一次）。
+
+        Args:
+            max_depth (int): 最大深度，为None时不限制
+            min_samples_split (int): 节点样本数少于该值时不再划分
+            criterion (str): 划分准则，'id3'为信息增益，'c45'为信息增益率
+            rows (np.ndarray): 训练使用的行下标，可以重复（如自助采样），为None时使用全部行
+            features (np.ndarray): 可用于划分的特征下标，为None时使用全部特征
+            max_features (int): 每个节点随机抽取的候选特征数，为None时所有特征都是候选；
+                候选特征都没有正增益时按抽取顺序继续检查其余特征，直到找到可用的划分
+            random_state: 抽取候选特征的随机种子或 np.random.Generator
+
+        Returns:
+            DecisionTree: self
+        """
+        if criterion not in CRITERIA:
+            raise ValueError("criterion must be one of %s" % (CRITERIA,))
+        rows = np.arange(len(self.labels)) if rows is None else np.asarray(rows)
+        features = np.arange(self.codes.shape[1]) if features is None else np.asarray(features)
+        sample = max_features is not None and max_features < len(features)
+        rng = np.random.default_rng(random_state) if sample else None
+        width = int(self.n_values[features].max()) if len(features) else 0
+        # 节点数组：划分特征（叶子为-1）、出现过的取值及其子节点、节点的多数类别
+        node_feature, node_children, node_class = [], [], []
+
+        stack = [(rows, self.count_tensor(rows, features), 0)]
+        while stack:
+            node_rows, counts, depth = stack.pop()
+            if counts is None:
+                counts = self.count_tensor(node_rows, features)
+            node = len(node_feature)
+            class_total = counts[0].sum(axis=0) if len(features) else self.class_counts(node_rows)
+            node_feature.append(-1)
+            node_children.append(None)
+            node_class.append(int(np.argmax(class_total)) if len(class_total) else 0)
+            n = len(node_rows)
+            if (n < min_samples_split or (max_depth is not None and depth >= max_depth)
+                    or np.count_nonzero(class_total) <= 1 or not len(features)):
+                continue
+
+            gain, _, _ = self.information_gain(counts=counts)
+            if criterion == 'c45':
+                # 分裂信息 H_A(D)，特征在节点上只有一个取值时为0
+                split_info = np.log2(n) - _xlogx(counts.sum(axis=2)).sum(axis=1) / n
+                gain = np.where(split_info > 1e-12, gain / np.maximum(split_info, 1e-12), 0)
+            if sample:
+                # 计数张量仍然一次统计全部特征，只在随机排列的前max_features个特征中选最优
+                perm = rng.permutation(len(features))
+                valid = np.flatnonzero(gain[perm] > 1e-12)
+                # 前max_features个都不可用时，扩大到第一个可用的特征为止
+                need = max(max_features, int(valid[0]) + 1) if len(valid) else max_features
+                candidates = perm[:need]
+                best = int(candidates[np.argmax(gain[candidates])])
+            else:
+                best = int(np.argmax(gain))
+            if gain[best] <= 1e-12:
+                continue
+
+            feature = int(features[best])
+            value_counts = counts[best].sum(axis=1)
+            # 按取值把行下标分组，子节点的行下标都是连续切片
+            order = np.argsort(self.codes[node_rows, feature], kind='stable')
+            groups = np.split(node_rows[order], np.cumsum(value_counts)[:-1])
+            present = np.flatnonzero(value_counts)
+            largest = present[np.argmax(value_counts[present])]
+            # 兄弟节点相减：最大子节点的计数 = 父节点 - 其余子节点
+            rest = np.zeros_like(counts)
+            child_counts = {}
+            # 子节点很多时计数张量放不进内存上限，只累加不保存，出栈时再重新统计
+            keep = len(present) * counts.size <= BLOCK_SIZE
+            for v in present:
+                if v != largest:
+                    child = self.count_tensor(groups[v], features)
+                    rest += child
+                    if keep:
+                        child_counts[v] = child
+            child_counts[largest] = counts - rest
+
+            # 逆序入栈，使子节点按取值从小到大出栈编号
+            for v in present[::-1]:
+                stack.append((groups[v], child_counts.get(v), depth + 1))
+            node_feature[node] = feature
+            node_children[node] = present
+
+        # 深度优先出栈的顺序就是节点编号，由此回填各子节点的编号
+        # 子节点只按出现过的取值稀疏保存为有序的边键，内存与边数成正比，而不是节点数×取值个数
+        self.tree_feature = np.array(node_feature, dtype=np.int64)
+        self.tree_class = np.array(node_class, dtype=np.int64)
+        self.tree_width = width
+        sizes = np.ones(len(node_feature), dtype=np.int64)
+        keys, children = [], []
+        for node in range(len(node_feature) - 1, -1, -1):
+            present = node_children[node]
+            if present is None:
+                continue
+            child = node + 1
+            targets = np.empty(len(present), dtype=np.int64)
+            for j in range(len(present)):
+                targets[j] = child
+                sizes[node] += sizes[child]
+                child += sizes[child]
+            keys.append(node * width + present)
+            children.append(targets)
+        # 节点是逆序处理的，反转后边键按节点编号、取值升序排列
+        self.tree_keys = np.concatenate(keys[::-1]) if keys else np.empty(0, dtype=np.int64)
+        self.tree_children = np.concatenate(children[::-1]) if children else np.empty(0, dtype=np.int64)
+        return self
+
+    def _encode_rows(self, x, features):
+        """
+        把待预测数据中指定特征的原始取值转换为训练时的整数编码
+
+        Args:
+            x (np.ndarray): 待预测数据，形状为(n, 特征数)
+            features (np.ndarray): 需要转换的特征下标
+
+        Returns:
+            np.ndarray: 形状为(n, 特征数)的编码，训练中没有出现过的取值为-1
+        """
+        codes = np.full(x.shape, -1, dtype=np.int64)
+        for f in features:
+            column = x[:, f]
+            if self.values[f] is None:
+                code = column.astype(np.int64)
+                valid = (code == column) & (code >= 0)
+            else:
+                uniques = self.values[f]
+                code = np.minimum(np.searchsorted(uniques, column), len(uniques) - 1)
+                valid = uniques[code] == column
+            codes[valid, f] = code[valid]
+        return codes
+
+    def predict(self, x):
+        """
+        批量预测类别，所有样本同时沿树向下走，每轮前进一层
+
+        遇到训练时该节点没有见过的取值时停在当前节点，使用节点的多数类别。
+
+        Args:
+            x (np.ndarray): 待预测数据，形状为(n, 特征数)或单个样本(特征数,)
+
+        Returns:
+            np.ndarray: 预测的类别，形状为(n,)
+        """
+        x = np.asarray(x)
+        if x.ndim == 1:
+            x = x[None, :]
+        used = np.unique(self.tree_feature[self.tree_feature >= 0])
+        labels = _traverse(self._encode_rows(x, used), self.tree_feature, self.tree_keys,
+                           self.tree_children, self.tree_width, self.tree_class)
+        return labels if self.classes is None else self.classes[labels]
+
+
+def _init_worker(name, shape, dtype, trees=None):
+    """
+    工作进程初始化：挂载父进程创建的共享内存，并构造数据视图
+
+    Args:
+        name (str): 共享内存名称
+        shape (tuple): 数组形状
+        dtype (str): 数组类型
+        trees (list): 预测时使用的各棵树，训练时为None
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    _SHARED['shm'] = shm
+    _SHARED['data'] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    _SHARED['trees'] = trees
+
+
+def _fit_tree(params, seed, n_features, matrix=None):
+    """
+    在自助采样的行上训练一棵树，每个节点在随机选取的特征中选择划分
+
+    Args:
+        params (dict): DecisionTree.fit 的参数
+        seed: 随机种子
+        n_features (int): 每个节点的候选特征数
+        matrix (np.ndarray): 编码后的训练矩阵（最后一列为类别），为None时使用共享内存中的矩阵
+
+    Returns:
+        tuple: (各节点划分特征, 边键, 子节点编号, 边键的取值上界, 各节点多数类别)，参数顺序同 _traverse
+    """
+    if matrix is None:
+        # 同一个进程训练多棵树时复用同一个 DecisionTree，只做一次编码检查
+        if 'tree' not in _SHARED:
+            _SHARED['tree'] = DecisionTree(_SHARED['data'])
+        tree = _SHARED['tree']
+    else:
+        tree = DecisionTree(matrix)
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(tree.labels), len(tree.labels))
+    tree.fit(rows=rows, max_features=n_features, random_state=rng, **params)
+    return tree.tree_feature, tree.tree_keys, tree.tree_children, tree.tree_width, tree.tree_class
+
+
+def _vote(start, stop, n_classes, codes=None, trees=None):
+    """
+    统计一段样本上各棵树的投票数
+
+    Args:
+        start (int): 起始行
+        stop (int): 结束行（不含）
+        n_classes (int): 类别数
+        codes (np.ndarray): 样本的特征编码，为None时使用共享内存中的编码
+        trees (list): 各棵树，为None时使用工作进程初始化时传入的树
+
+    Returns:
+        np.ndarray: 形状为(stop - start, n_classes)的票数
+    """
+    codes = (_SHARED['data'] if codes is None else codes)[start:stop]
+    trees = _SHARED['trees'] if trees is None else trees
+    votes = np.zeros((len(codes), n_classes), dtype=np.int64)
+    index = np.arange(len(codes))
+    for tree in trees:
+        votes[index, _traverse(codes, *tree)] += 1
+    return votes
+
+
+class BaggedTrees:
+    """
+    随机森林：每棵树在有放回抽样的行上训练，每个节点只在随机选取的特征子集中选择划分，
+    预测时多数投票
+    """
+
+    def __init__(self, n_estimators=10, max_features='sqrt', max_depth=None, min_samples_split=2,
+                 criterion='id3', n_jobs=None, random_state=None):
+        """
+        初始化集成模型
+
+        Args:
+            n_estimators (int): 树的数量
+            max_features: 每个节点的候选特征数，'sqrt'为特征数的平方根，
+                'log2'为以2为底的对数，整数为具体个数，None为全部特征
+            max_depth (int): 每棵树的最大深度
+            min_samples_split (int): 节点样本数少于该值时不再划分
+            criterion (str): 划分准则，见 CRITERIA
+            n_jobs (int): 进程数，为None时使用CPU核数，为1时在当前进程中执行
+            random_state: 随机种子，用于生成每棵树的抽样种子
+        """
+        self.n_estimators = n_estimators
+        self.max_features = max_features
+        self.params = dict(max_depth=max_depth, min_samples_split=min_samples_split,
+                           criterion=criterion)
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def _n_features(self, total):
+        """
+        计算每个节点的候选特征数
+
+        Args:
+            total (int): 特征总数
+
+        Returns:
+            int: 特征数，至少为1
+        """
+        if self.max_features is None:
+            return total
+        if self.max_features == 'sqrt':
+            k = int(np.sqrt(total))
+        elif self.max_features == 'log2':
+            k = int(np.log2(total)) if total > 0 else 0
+        else:
+            k = int(self.max_features)
+        return min(max(k, 1), total)
+
+    def fit(self, matrix):
+        """
+        训练所有的树
+
+        原始数据先编码为非负整数矩阵，并行时放入共享内存，各进程直接读取，不复制训练数据。
+
+        Args:
+            matrix (np.ndarray): 训练数据矩阵，最后一列为类别
+
+        Returns:
+            BaggedTrees: self
+        """
+        if self.params['criterion'] not in CRITERIA:
+            raise ValueError("criterion must be one of %s" % (CRITERIA,))
+        # 保留原始取值到编码的映射，用于预测时转换输入
+        self.encoder = DecisionTree(matrix)
+        encoded = np.column_stack([self.encoder.codes, self.encoder.labels]).astype(np.int64)
+        n_features = self._n_features(encoded.shape[1] - 1)
+        seeds = np.random.SeedSequence(self.random_state).spawn(self.n_estimators)
+
+        if self.n_jobs == 1:
+            self.trees = [_fit_tree(self.params, seed, n_features, encoded) for seed in seeds]
+            return self
+        shm = shared_memory.SharedMemory(create=True, size=max(encoded.nbytes, 1))
+        try:
+            np.ndarray(encoded.shape, dtype=encoded.dtype, buffer=shm.buf)[:] = encoded
+            with ProcessPoolExecutor(
+                    max_workers=self.n_jobs, initializer=_init_worker,
+                    initargs=(shm.name, encoded.shape, encoded.dtype.str)) as pool:
+                self.trees = list(pool.map(_fit_tree, [self.params] * self.n_estimators, seeds,
+                                           [n_features] * self.n_estimators))
+        finally:
+            shm.close()
+            shm.unlink()
+        return self
+
+    def predict(self, x):
+        """
+        批量预测类别，各棵树投票，票数相同时取编码较小的类别
+
+        并行时把样本按行分段，每个进程统计一段样本上所有树的票数。
+
+        Args:
+            x (np.ndarray): 待预测数据，形状为(n, 特征数)或单个样本(特征数,)
+
+        Returns:
+            np.ndarray: 预测的类别，形状为(n,)
+        """
+        x = np.asarray(x)
+        if x.ndim == 1:
+            x = x[None, :]
+        encoder = self.encoder
+        codes = encoder._encode_rows(x, np.arange(x.shape[1]))
+        n_classes = encoder.n_classes
+
+        n_jobs = self.n_jobs or os.cpu_count() or 1
+        if n_jobs == 1 or len(codes) == 0:
+            votes = _vote(0, len(codes), n_classes, codes, self.trees)
+        else:
+            shm = shared_memory.SharedMemory(create=True, size=max(codes.nbytes, 1))
+            try:
+                np.ndarray(codes.shape, dtype=codes.dtype, buffer=shm.buf)[:] = codes
+                bounds = np.linspace(0, len(codes), n_jobs + 1).astype(int)
+                with ProcessPoolExecutor(
+                        max_workers=n_jobs, initializer=_init_worker,
+                        initargs=(shm.name, codes.shape, codes.dtype.str, self.trees)) as pool:
+                    votes = np.concatenate(list(pool.map(_vote, bounds[:-1], bounds[1:],
+                                                         [n_classes] * n_jobs)))
+            finally:
+                shm.close()
+                shm.unlink()
+        labels = np.argmax(votes, axis=1)
+        return labels if encoder.classes is None else encoder.classes[labels]
+
+
+if __name__ == "__main__":
+    # 6
+    # 1 1 0 1 1 0
+    # 1 0 0 1 1 1
+    # 0 1 0 0 1 1
+    # 0 1 0 1 0 0
+    # 0 1 0 0 0 0
+    # 0 0 0 1 0 0
+    # 获取输入数据并计算整体熵值
+    input_matrix = input_data()
+    decision_tree = DecisionTree(input_matrix)
+    HD = decision_tree.get_entropy(input_matrix)
+    GDA = decision_tree.calculate_information_gain(HD)
+
+    # 输出信息增益最大的特征索引和对应的信息增益值
+    if GDA:
+        max_entropy = max(GDA)
+        print(GDA.index(max_entropy), max_entropy)
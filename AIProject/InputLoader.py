@@ -0,0 +1,126 @@
+import io
+import sys
+
+import numpy as np
+
+# 每次从输入流读取的字节数
+CHUNK_SIZE = 1 << 24
+
+
+def open_input(source=None):
+    """
+    获取二进制输入流
+
+    Args:
+        source: 为None时使用标准输入；为字符串时视为文件路径；否则视为已打开的二进制流
+
+    Returns:
+        二进制输入流
+    """
+    if source is None:
+        buffer = getattr(sys.stdin, 'buffer', None)
+        if buffer is None:
+            # sys.stdin被替换为文本流（例如io.StringIO）时退回到整体读取
+            return io.BytesIO(sys.stdin.read().encode())
+        return buffer
+    if isinstance(source, str):
+        return open(source, 'rb')
+    return source
+
+
+def read_line(stream, dtype=np.float64):
+    """
+    读取一行并解析为NumPy数组
+
+    Args:
+        stream: 二进制输入流
+        dtype: 数组的数据类型
+
+    Returns:
+        np.ndarray: 该行中的所有数字
+
+    Raises:
+        ValueError: 读到空行或输入已经结束
+    """
+    line = stream.readline()
+    # np.fromstring对空白字符串会返回[-1.]而不是空数组，这里提前拦截
+    if not line.strip():
+        raise ValueError("expected a line of numbers, got a blank line or end of input")
+    return np.fromstring(line, dtype=dtype, sep=' ')
+
+
+def iter_array(stream, count=None, dtype=np.float64, chunk_size=CHUNK_SIZE):
+    """
+    按大块读取输入流中的数字，每读一块就解析并产出一个NumPy数组
+
+    每次读取chunk_size字节，在最后一个空白字符处切开，剩余的半个数字留到下一块，
+    整块交给np.fromstring解析，不再逐行split和map。调用方提前停止迭代时不会再读取后续输入。
+
+    Args:
+        stream: 二进制输入流
+        count: 需要的数字个数，为None时读到输入结束；读到count个后不再继续读取
+        dtype: 数组的数据类型
+        chunk_size (int): 每次读取的字节数
+
+    Yields:
+        np.ndarray: 一块中解析出的一维数组，合计不超过count个数字
+    """
+    total = 0
+    tail = b''
+    while count is None or total < count:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        chunk = tail + chunk
+        cut = max(chunk.rfind(b' '), chunk.rfind(b'\n'), chunk.rfind(b'\t'))
+        if cut < 0:
+            tail = chunk
+            continue
+        tail = chunk[cut + 1:]
+        # 纯空白的块会被np.fromstring解析成[-1.]，直接跳过
+        if not chunk[:cut + 1].strip():
+            continue
+        part = np.fromstring(chunk[:cut + 1], dtype=dtype, sep=' ')
+        if count is not None:
+            part = part[:count - total]
+        total += len(part)
+        yield part
+    if tail.strip() and (count is None or total < count):
+        part = np.fromstring(tail, dtype=dtype, sep=' ')
+        yield part if count is None else part[:count - total]
+
+
+def read_array(stream, count=None, dtype=np.float64, chunk_size=CHUNK_SIZE):
+    """
+    按大块读取输入流中剩余的所有数字，直接解析为NumPy数组
+
+    Args:
+        stream: 二进制输入流
+        count: 需要的数字个数，为None时返回全部；读到count个后不再继续读取
+        dtype: 数组的数据类型
+        chunk_size (int): 每次读取的字节数
+
+    Returns:
+        np.ndarray: 一维数组，输入为空时返回空数组
+    """
+    parts = list(iter_array(stream, count, dtype, chunk_size))
+    return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+
+def read_matrix(stream, rows, dtype=np.float64):
+    """
+    读取rows行等长的数字，列数由第一行决定
+
+    Args:
+        stream: 二进制输入流
+        rows (int): 行数
+        dtype: 数组的数据类型
+
+    Returns:
+        np.ndarray: 形状为(rows, cols)的二维数组
+    """
+    if rows <= 0:
+        return np.empty((0, 0), dtype=dtype)
+    first = read_line(stream, dtype)
+    rest = read_array(stream, (rows - 1) * len(first), dtype)
+    return np.concatenate([first, rest]).reshape(rows, len(first))
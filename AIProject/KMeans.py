@@ -1,5 +1,306 @@
+from concurrent.futures import ProcessPoolExecutor  # 多进程并行执行多次重启
+from itertools import islice  # 按块读取文本文件的行
+from multiprocessing import shared_memory  # 进程间共享数据点，避免序列化
+
 import numpy as np  # 导入numpy库，用于数值计算
 
+# 分块计算距离矩阵时每块包含的点数，避免一次性构造(n, k)的巨大矩阵
+BLOCK_SIZE = 65536
+
+# 展开式计算的距离存在舍入误差，最近与次近距离之差小于该相对阈值时按原始公式精确复核
+_TIE_RTOL = 1e-9
+
+# 未指定k和max_iter时的默认最大迭代次数
+MAX_ITER = 300
+
+# 工作进程中挂载的共享内存及其上的数据点视图
+_SHARED = {}
+
+
+def _own_distance(block, centers, labels, weights=None):
+    """
+    直接按 ||w * (x - c)|| 计算每个点到其所属中心的精确距离
+
+    Args:
+        block (np.ndarray): 数据块，形状为(b, d)
+        centers (np.ndarray): 聚类中心，形状为(k, d)
+        labels (np.ndarray): 每个点所属簇的索引，形状为(b,)
+        weights (np.ndarray): 维度权重，形状为(d,)，为None时不加权
+
+    Returns:
+        np.ndarray: 距离，形状为(b,)
+    """
+    diff = np.asarray(block, dtype=np.float64) - centers[labels]
+    if weights is not None:
+        diff *= weights
+    return np.sqrt(np.einsum('ij,ij->i', diff, diff))
+
+
+def _center_shift(old, new, weights=None):
+    """
+    计算每个聚类中心在（加权）度量下的移动距离
+
+    Args:
+        old (np.ndarray): 更新前的聚类中心，形状为(k, d)
+        new (np.ndarray): 更新后的聚类中心，形状为(k, d)
+        weights (np.ndarray): 维度权重，形状为(d,)，为None时不加权
+
+    Returns:
+        np.ndarray: 每个中心的移动距离，形状为(k,)
+    """
+    diff = np.asarray(new, dtype=np.float64) - old
+    if weights is not None:
+        diff *= weights
+    return np.sqrt(np.einsum('ij,ij->i', diff, diff))
+
+
+def _pairwise_sq(centers, weights=None):
+    """
+    精确计算聚类中心两两之间的（加权）平方距离
+
+    Args:
+        centers (np.ndarray): 聚类中心，形状为(k, d)
+        weights (np.ndarray): 维度权重，形状为(d,)，为None时不加权
+
+    Returns:
+        np.ndarray: 平方距离矩阵，形状为(k, k)
+    """
+    diff = np.asarray(centers, dtype=np.float64)[:, None, :] - centers[None, :, :]
+    if weights is not None:
+        diff *= weights
+    return np.einsum('ijk,ijk->ij', diff, diff)
+
+
+def _block_assign(block, centers, weights=None, with_bounds=False):
+    """
+    计算一个数据块中每个点最近的聚类中心
+
+    使用 ||x||² - 2x·c + ||c||² 的展开式通过矩阵乘法一次得到整块的距离矩阵，
+    带权重时先把权重乘到点和中心上，等价于 ||w * (x - c)||²。
+    对最近与次近距离几乎相等的点，按原始逐点公式重新计算，保证与逐点实现的结果一致。
+
+    Args:
+        block (np.ndarray): 数据块，形状为(b, d)
+        centers (np.ndarray): 聚类中心，形状为(k, d)
+        weights (np.ndarray): 维度权重，形状为(d,)，为None时不加权
+        with_bounds (bool): 是否同时返回Hamerly剪枝所需的距离上下界
+
+    Returns:
+        np.ndarray: 每个点所属簇的索引，形状为(b,)；
+            with_bounds为True时返回(labels, upper, lower)，upper为到所属中心的精确距离，
+            lower为到其他中心最近距离的下界（已扣除展开式的舍入误差）
+    """
+    x = np.asarray(block, dtype=np.float64)
+    c = np.asarray(centers, dtype=np.float64)
+    if weights is not None:
+        x = x * weights
+        c = c * weights
+    x_sq = np.einsum('ij,ij->i', x, x)
+    c_sq = np.einsum('ij,ij->i', c, c)
+    # 距离矩阵 (b, k)
+    dist = x_sq[:, None] - 2 * (x @ c.T) + c_sq[None, :]
+    labels = np.argmin(dist, axis=1)
+    if len(c) < 2:
+        if with_bounds:
+            upper = _own_distance(block, centers, labels, weights)
+            return labels, upper, np.full(len(labels), np.inf)
+        return labels
+
+    # 找出最近与次近距离差距在舍入误差范围内的点
+    part = np.partition(dist, 1, axis=1)
+    scale = x_sq + c_sq.max()
+    ambiguous = np.flatnonzero(part[:, 1] - part[:, 0] <= _TIE_RTOL * scale)
+    if len(ambiguous):
+        # 按原始公式 ||w * (p - c)|| 逐点精确复核
+        diff = np.asarray(block, dtype=np.float64)[ambiguous][:, None, :] - centers[None, :, :]
+        if weights is not None:
+            diff = weights * diff
+        labels[ambiguous] = np.argmin(np.linalg.norm(diff, axis=2), axis=1)
+    if not with_bounds:
+        return labels
+
+    upper = _own_distance(block, centers, labels, weights)
+    # 展开式的绝对误差上界，从次近距离中扣除后得到可靠的下界
+    err = 4 * (x.shape[1] + 2) * np.finfo(np.float64).eps * scale
+    lower = np.sqrt(np.maximum(part[:, 1] - err, 0))
+    return labels, upper, lower
+
+
+def _accumulate(block, labels, sums, counts):
+    """
+    将一个数据块按所属簇累加到各簇的坐标和与点数上
+
+    Args:
+        block (np.ndarray): 数据块，形状为(b, d)
+        labels (np.ndarray): 每个点所属簇的索引，形状为(b,)
+        sums (np.ndarray): 各簇坐标和，形状为(k, d)，原地累加
+        counts (np.ndarray): 各簇点数，形状为(k,)，原地累加
+    """
+    k = len(counts)
+    counts += np.bincount(labels, minlength=k)
+    # 逐维度使用bincount求和，比np.add.at快得多
+    for j in range(sums.shape[1]):
+        sums[:, j] += np.bincount(labels, weights=block[:, j], minlength=k)
+
+
+def _update_centers(centers, sums, counts):
+    """
+    用各簇的均值更新聚类中心，空簇保持原中心不变
+
+    Args:
+        centers (np.ndarray): 聚类中心，形状为(k, d)，原地更新
+        sums (np.ndarray): 各簇坐标和，形状为(k, d)
+        counts (np.ndarray): 各簇点数，形状为(k,)
+    """
+    nonempty = counts > 0
+    centers[nonempty] = sums[nonempty] / counts[nonempty, None]
+
+
+def kmeans_plus_plus(points, n_clusters, rng, weights=None, block_size=BLOCK_SIZE):
+    """
+    使用k-means++策略选择初始聚类中心
+
+    第一个中心均匀随机选取，之后每个中心按点到已选中心最近（加权）平方距离的比例抽样。
+
+    Args:
+        points (np.ndarray): 数据点集合，形状为(n, d)
+        n_clusters (int): 聚类数量
+        rng (np.random.Generator): 随机数生成器
+        weights (np.ndarray): 维度权重，形状为(d,)，为None时不加权
+        block_size (int): 分块计算距离时每块的点数
+
+    Returns:
+        np.ndarray: 初始聚类中心，形状为(n_clusters, d)
+    """
+    n = len(points)
+    centers = np.empty((n_clusters, points.shape[1]))
+    centers[0] = points[rng.integers(n)]
+    # 每个点到已选中心的最近平方距离
+    closest = np.full(n, np.inf)
+    for i in range(1, n_clusters):
+        for start in range(0, n, block_size):
+            block = points[start:start + block_size]
+            d = _own_distance(block, centers[i - 1:i], np.zeros(len(block), dtype=np.int64), weights)
+            np.minimum(closest[start:start + block_size], d ** 2, out=closest[start:start + block_size])
+        total = closest.sum()
+        if total > 0:
+            idx = np.searchsorted(np.cumsum(closest), rng.random() * total, side='right')
+            centers[i] = points[min(idx, n - 1)]
+        else:
+            # 所有点都与已选中心重合，随机补齐
+            centers[i] = points[rng.integers(n)]
+    return centers
+
+
+def _inertia(points, centers, weights=None, block_size=BLOCK_SIZE):
+    """
+    计算所有点到最近聚类中心的（加权）平方距离之和
+
+    Args:
+        points (np.ndarray): 数据点集合，形状为(n, d)
+        centers (np.ndarray): 聚类中心，形状为(k, d)
+        weights (np.ndarray): 维度权重，形状为(d,)，为None时不加权
+        block_size (int): 分块计算距离时每块的点数
+
+    Returns:
+        float: 簇内平方和
+    """
+    total = 0.0
+    for start in range(0, len(points), block_size):
+        block = points[start:start + block_size]
+        labels = _block_assign(block, centers, weights)
+        total += float(np.sum(_own_distance(block, centers, labels, weights) ** 2))
+    return total
+
+
+def _init_worker(name, shape, dtype):
+    """
+    工作进程初始化：挂载父进程创建的共享内存，并构造数据点视图
+
+    Args:
+        name (str): 共享内存名称
+        shape (tuple): 数据点数组形状
+        dtype (str): 数据点数组类型
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    _SHARED['shm'] = shm
+    _SHARED['points'] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _run_restart(params, seed, weights=None, points=None):
+    """
+    执行一次k-means++初始化加Lloyd迭代的完整聚类
+
+    Args:
+        params (dict): KMeans构造参数
+        seed (np.random.SeedSequence): 本次重启的随机种子
+        weights (np.ndarray): 维度权重，形状为(d,)，为None时不加权
+        points (np.ndarray): 数据点集合，为None时使用工作进程中的共享数据点
+
+    Returns:
+        tuple: (簇内平方和, 聚类中心, 迭代次数)
+    """
+    if points is None:
+        points = _SHARED['points']
+    model = KMeans(**params)
+    centers = kmeans_plus_plus(points, model.n_clusters, np.random.default_rng(seed),
+                               weights, model.block_size)
+    model._lloyd(points, centers, weights)
+    return _inertia(points, centers, weights, model.block_size), centers, model.n_iter
+
+
+def open_points(path, dim=None, dtype=np.float64):
+    """
+    以内存映射方式打开磁盘上的点集文件，不把数据读入内存
+
+    Args:
+        path (str): 文件路径，.npy文件直接映射；其他文件视为按行优先存储的原始二进制
+        dim (int): 原始二进制文件中每个点的维度，.npy文件可不传
+        dtype: 原始二进制文件的数据类型
+
+    Returns:
+        np.memmap: 形状为(n, d)的只读内存映射数组
+    """
+    if str(path).endswith('.npy'):
+        return np.load(path, mmap_mode='r')
+    if dim is None:
+        raise ValueError("dim is required for raw binary point files")
+    return np.memmap(path, dtype=dtype, mode='r').reshape(-1, dim)
+
+
+def iter_chunks(points, chunk_size=BLOCK_SIZE):
+    """
+    按块遍历点集，对np.memmap每次只会读入一块数据
+
+    Args:
+        points (np.ndarray): 点集或内存映射数组，形状为(n, d)
+        chunk_size (int): 每块的点数
+
+    Yields:
+        np.ndarray: 形状为(b, d)的数据块
+    """
+    for start in range(0, len(points), chunk_size):
+        yield np.asarray(points[start:start + chunk_size], dtype=np.float64)
+
+
+def iter_text_chunks(path, chunk_size=BLOCK_SIZE):
+    """
+    按块读取文本点集文件，每行一个点，各维度用逗号分隔，如 "1.0,2.0"
+
+    Args:
+        path (str): 文本文件路径
+        chunk_size (int): 每块的行数
+
+    Yields:
+        np.ndarray: 形状为(b, d)的数据块
+    """
+    with open(path) as f:
+        while True:
+            lines = list(islice(f, chunk_size))
+            if not lines:
+                return
+            yield np.loadtxt(lines, delimiter=',', ndmin=2)
+
 
 class KMeans:
     """
@@ -11,58 +312,181 @@ class KMeans:
     收敛判断：重复步骤2-3直到簇中心不再变化或达到最大迭代次数
     """
 
-    def __init__(self, k: int):
+    def __init__(self, k: int = None, n_clusters: int = None, max_iter: int = None,
+                 tol: float = 0.0, block_size: int = BLOCK_SIZE, n_init: int = 1,
+                 n_jobs: int = None, random_state=None):
         """
         This function is used to initialize the K-Means algorithm.
 
         Args:
-            k (int): 聚类的数量，即需要将数据分为k个簇
+            k (int): 兼容旧接口的参数，历史上被当作迭代次数使用，未指定max_iter时作为max_iter
+            n_clusters (int): 聚类的数量，即需要将数据分为多少个簇，为None时由初始中心决定
+            max_iter (int): 最大迭代次数，k和max_iter都未指定时为MAX_ITER
+            tol (float): 收敛阈值，所有中心的移动距离都不超过tol时提前结束，
+                默认0表示中心完全不再变化时结束（结果与跑满迭代次数相同）
+            block_size (int): 分块计算距离矩阵时每块的点数
+            n_init (int): 未给定初始中心时，使用k-means++初始化重复聚类的次数
+            n_jobs (int): 并行执行重启的进程数，为None时使用CPU核数，为1时在当前进程顺序执行
+            random_state: k-means++初始化的随机种子
         """
         self.k = k  # 保存聚类数量k
+        self.n_clusters = n_clusters
+        if max_iter is None:
+            max_iter = k if k is not None else MAX_ITER
+        self.max_iter = max_iter
+        self.tol = tol
+        self.block_size = block_size
+        self.n_init = n_init
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        # 最近一次聚类实际执行的迭代次数
+        self.n_iter = 0
+        # 最近一次多次重启聚类中最优结果的簇内平方和
+        self.inertia = None
+
+    def _check_centers(self, centers):
+        """
+        校验初始聚类中心的数量与n_clusters一致
 
-    def cluster(self, points: np.ndarray, centers: np.ndarray):
+        Args:
+            centers (np.ndarray): 初始聚类中心，形状为(k, d)
         """
-        执行K-Means聚类算法
+        if self.n_clusters is not None and len(centers) != self.n_clusters:
+            raise ValueError(
+                "expected %d initial centers, got %d" % (self.n_clusters, len(centers)))
+
+    def _lloyd(self, points, centers, weights=None):
+        """
+        分块执行Lloyd迭代，并用Hamerly距离界跳过大部分点到中心的距离计算
+
+        每个点维护到所属中心距离的上界u和到其他中心距离的下界l。
+        中心移动后u加上所属中心的移动距离，l减去其他中心的最大移动距离；
+        只有 u > max(l, 所属中心到最近其他中心距离的一半) 的点才可能改变归属，
+        先把u收紧为精确距离，仍不满足时才重新计算到所有中心的距离。
 
         Args:
-            points (np.ndarray): 需要聚类的数据点集合，形状为(n, d)，n为点数，d为维度
-            centers (np.ndarray): 初始聚类中心点，形状为(k, d)，k为聚类数
+            points (np.ndarray): 数据点集合，形状为(n, d)
+            centers (np.ndarray): 初始聚类中心，形状为(k, d)，原地更新
+            weights (np.ndarray): 维度权重，形状为(d,)，为None时不加权
 
         Returns:
-            list: 排序后的聚类中心点列表，各中心点按照指定规则排序
+            list: 排序后的聚类中心点列表
         """
-        # 迭代优化聚类中心，迭代k次
-        # 注意：这里使用k作为迭代次数，但通常K-Means使用固定迭代次数或收敛条件
-        for _ in range(self.k):
-            # 初始化分类字典，为每个聚类中心创建一个空列表
-            # clf字典的键是聚类中心索引，值是属于该簇的所有数据点
-            clf = {}
-            for i in range(len(centers)):
-                clf[i] = []  # 为每个聚类中心创建空列表
-
-            # 将每个点分配给最近的聚类中心（分配步骤）
-            for point in points:
-                # 计算当前点到各个聚类中心的欧几里得距离
-                # np.linalg.norm计算向量的范数（默认是2-范数，即欧几里得距离）
-                distances = [np.linalg.norm(point - center)
-                             for center in centers]
-                # np.argmin返回最小距离的索引，即最近的聚类中心
-                minIdx = np.argmin(distances)
-                # 将当前点添加到对应的聚类簇中
-                clf[minIdx].append(point)
-
-            # 更新聚类中心为各簇的平均值（更新步骤）
-            for i in range(len(centers)):
-                # 计算第i个簇中所有点的平均值作为新的聚类中心
-                # axis=0表示沿着第一个维度（行）求平均，即对所有点的每个维度分别求平均
-                if (len(clf[i]) > 0):
-                    centers[i] = np.mean(clf[i], axis=0)
+        self._check_centers(centers)
+        points = np.asarray(points)
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64)
+        n_centers, dim = centers.shape
+        n, bs = len(points), self.block_size
+        self.n_iter = 0
+        if self.max_iter <= 0:
+            return sorted(centers.tolist(), key=lambda x: (x[0], x[1]))
+
+        # 第一次分配需要计算全部距离
+        labels = np.empty(n, dtype=np.int64)
+        upper = np.empty(n)
+        lower = np.empty(n)
+        for start in range(0, n, bs):
+            sl = slice(start, start + bs)
+            labels[sl], upper[sl], lower[sl] = _block_assign(points[sl], centers, weights, True)
+
+        while True:
+            # 更新步骤
+            sums = np.zeros((n_centers, dim))
+            counts = np.zeros(n_centers, dtype=np.int64)
+            for start in range(0, n, bs):
+                _accumulate(points[start:start + bs], labels[start:start + bs], sums, counts)
+            old = centers.copy()
+            _update_centers(centers, sums, counts)
+            self.n_iter += 1
+            shift = _center_shift(old, centers, weights)
+            if shift.max() <= self.tol or self.n_iter >= self.max_iter:
+                break
+
+            # 根据中心移动距离放宽上下界
+            upper += shift[labels]
+            if n_centers > 1:
+                first, second = np.argsort(shift)[::-1][:2]
+                lower -= np.where(labels == first, shift[second], shift[first])
+            # 每个中心到最近其他中心距离的一半
+            half = 0.5 * np.sqrt(np.min(
+                np.where(np.eye(n_centers, dtype=bool), np.inf,
+                         _pairwise_sq(centers, weights)), axis=1))
+            bound = np.maximum(half[labels], lower) * (1 - _TIE_RTOL)
+
+            # 收紧上界后仍可能改变归属的点，才重新计算到所有中心的距离
+            cand = np.flatnonzero(upper > bound)
+            for start in range(0, len(cand), bs):
+                idx = cand[start:start + bs]
+                upper[idx] = _own_distance(points[idx], centers, labels[idx], weights)
+            cand = cand[upper[cand] > bound[cand]]
+            for start in range(0, len(cand), bs):
+                idx = cand[start:start + bs]
+                labels[idx], upper[idx], lower[idx] = _block_assign(points[idx], centers, weights, True)
 
         # 对结果进行排序并返回
         # 按照第一维（x坐标）和第二维（y坐标）进行排序
         # 这样可以确保输出结果的一致性
         return sorted(centers.tolist(), key=lambda x: (x[0], x[1]))
 
+    def _multi_restart(self, points, weights=None):
+        """
+        使用k-means++初始化重复聚类n_init次，返回簇内平方和最小的结果
+
+        多进程执行时数据点复制到共享内存中，各工作进程直接挂载，不再序列化传输。
+
+        Args:
+            points (np.ndarray): 数据点集合，形状为(n, d)
+            weights (np.ndarray): 维度权重，形状为(d,)，为None时不加权
+
+        Returns:
+            list: 排序后的聚类中心点列表
+        """
+        if self.n_clusters is None:
+            raise ValueError("n_clusters is required when no initial centers are given")
+        points = np.ascontiguousarray(points, dtype=np.float64)
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64)
+        params = dict(n_clusters=self.n_clusters, max_iter=self.max_iter, tol=self.tol,
+                      block_size=self.block_size)
+        seeds = np.random.SeedSequence(self.random_state).spawn(self.n_init)
+
+        if self.n_jobs == 1 or self.n_init == 1:
+            results = [_run_restart(params, seed, weights, points) for seed in seeds]
+        else:
+            shm = shared_memory.SharedMemory(create=True, size=max(points.nbytes, 1))
+            try:
+                np.ndarray(points.shape, dtype=points.dtype, buffer=shm.buf)[:] = points
+                with ProcessPoolExecutor(
+                        max_workers=self.n_jobs, initializer=_init_worker,
+                        initargs=(shm.name, points.shape, points.dtype.str)) as pool:
+                    results = list(pool.map(_run_restart, [params] * self.n_init, seeds,
+                                            [weights] * self.n_init))
+            finally:
+                shm.close()
+                shm.unlink()
+
+        # 簇内平方和相同时取序号最小的重启，保证结果可复现
+        best = min(range(len(results)), key=lambda i: results[i][0])
+        self.inertia, centers, self.n_iter = results[best]
+        return sorted(centers.tolist(), key=lambda x: (x[0], x[1]))
+
+    def cluster(self, points: np.ndarray, centers: np.ndarray = None):
+        """
+        执行K-Means聚类算法
+
+        Args:
+            points (np.ndarray): 需要聚类的数据点集合，形状为(n, d)，n为点数，d为维度
+            centers (np.ndarray): 初始聚类中心点，形状为(k, d)，k为聚类数；
+                为None时使用k-means++初始化并重复n_init次，取簇内平方和最小的结果
+
+        Returns:
+            list: 排序后的聚类中心点列表，各中心点按照指定规则排序
+        """
+        if centers is None:
+            return self._multi_restart(points)
+        return self._lloyd(points, centers)
+
     def cluster_weighted(
             self, points: np.ndarray, centers: np.ndarray, weights: np.ndarray
     ):
@@ -71,38 +495,78 @@ class KMeans:
 
         Args:
             points (np.ndarray): 需要聚类的数据点集合，形状为(n, d)，n为点数，d为维度
-            centers (np.ndarray): 初始聚类中心点，形状为(k, d)，k为聚类数
+            centers (np.ndarray): 初始聚类中心点，形状为(k, d)，k为聚类数；
+                为None时使用k-means++初始化并重复n_init次，取簇内平方和最小的结果
             weights (np.ndarray): 权重向量，形状为(d,)，d为数据维度
 
         Returns:
             list: 排序后的聚类中心点列表，各中心点按照指定规则排序
         """
-        # 迭代优化聚类中心，迭代k次
-        for _ in range(self.k):
-            # 初始化分类字典，为每个聚类中心创建一个空列表
-            clf = {}
-            for i in range(len(centers)):
-                clf[i] = []
-
-            # 将每个点分配给最近的聚类中心（基于加权距离）
-            for point in points:
-                # 计算加权欧几里得距离
-                distances = []
-                for center in centers:
-                    # 方法1：对每个维度应用权重
-                    weighted_diff = weights * (point - center)
-                    distance = np.linalg.norm(weighted_diff)
-                    distances.append(distance)
-
-                minIdx = np.argmin(distances)
-                clf[minIdx].append(point)
-
-            # 更新聚类中心为各簇的平均值（更新步骤）
-            for i in range(len(centers)):
-                if len(clf[i]) > 0:
-                    centers[i] = np.mean(clf[i], axis=0)
+        # 距离按 ||weights * (point - center)|| 计算，中心仍取簇内点的普通均值
+        if centers is None:
+            return self._multi_restart(points, weights)
+        return self._lloyd(points, centers, weights)
+
+    def cluster_stream(self, source, centers: np.ndarray, weights: np.ndarray = None,
+                       mode: str = 'minibatch'):
+        """
+        对无法一次放入内存的点集进行流式K-Means聚类
+
+        两种模式都沿用 cluster_weighted 的语义：按 ||weights * (point - center)|| 分配，
+        中心取簇内点的普通均值，最多遍历数据 max_iter 轮，一轮内中心的移动距离都不超过tol时提前结束。
+        - 'minibatch'：每读入一块就用各簇累计点数做增量均值更新中心，
+          c += (块内簇和 - 块内点数 * c) / 累计点数
+        - 'full'：每轮完整扫描一遍数据累计各簇坐标和与点数，扫描结束后再更新中心，
+          结果与 cluster_weighted 一致
+
+        Args:
+            source: 点集来源。可以是ndarray/np.memmap（按block_size切块读取），
+                或者一个无参可调用对象，每次调用返回一个新的数据块迭代器
+                （例如 lambda: iter_text_chunks(path)），用于多轮遍历
+            centers (np.ndarray): 初始聚类中心点，形状为(k, d)
+            weights (np.ndarray): 维度权重，形状为(d,)，为None时不加权
+            mode (str): 'minibatch' 或 'full'
+
+        Returns:
+            list: 排序后的聚类中心点列表，各中心点按照指定规则排序
+        """
+        if mode not in ('minibatch', 'full'):
+            raise ValueError("mode must be 'minibatch' or 'full'")
+        if callable(source):
+            make_chunks = source
+        else:
+            def make_chunks():
+                return iter_chunks(source, self.block_size)
+        self._check_centers(centers)
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64)
+        n_centers, dim = centers.shape
+        # 小批量模式下各簇累计见过的点数，跨轮次保留
+        seen = np.zeros(n_centers, dtype=np.int64)
+
+        self.n_iter = 0
+        while self.n_iter < self.max_iter:
+            old = centers.copy()
+            sums = np.zeros((n_centers, dim))
+            counts = np.zeros(n_centers, dtype=np.int64)
+            for chunk in make_chunks():
+                labels = _block_assign(chunk, centers, weights)
+                if mode == 'full':
+                    _accumulate(chunk, labels, sums, counts)
+                    continue
+                # 小批量模式：只统计当前块，然后立即更新中心
+                batch_sums = np.zeros((n_centers, dim))
+                batch_counts = np.zeros(n_centers, dtype=np.int64)
+                _accumulate(chunk, labels, batch_sums, batch_counts)
+                seen += batch_counts
+                hit = batch_counts > 0
+                centers[hit] += (batch_sums[hit] - batch_counts[hit, None] * centers[hit]) / seen[hit, None]
+            if mode == 'full':
+                _update_centers(centers, sums, counts)
+            self.n_iter += 1
+            if _center_shift(old, centers, weights).max() <= self.tol:
+                break
 
-        # 对结果进行排序并返回
         return sorted(centers.tolist(), key=lambda x: (x[0], x[1]))
 
 
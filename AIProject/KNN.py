@@ -1,5 +1,16 @@
+from collections import Counter
+
 import numpy as np
 
+# 分块计算距离时每块包含的节点数
+BLOCK_SIZE = 65536
+
+# 批量查询时单个距离矩阵块允许占用的内存上限（字节）
+MAX_MEMORY = 256 * 1024 * 1024
+
+# 矩阵乘法展开式计算的距离存在舍入误差，与第k近距离相差小于该相对阈值的节点视为并列，按原始公式复核
+_TIE_RTOL = 1e-9
+
 
 def distance(p1, p2):
     """
@@ -53,20 +64,269 @@ def knn(node_id, nodes, k):
     # 统计k个最近邻中各类别标签的数量
     # 提取每个最近邻节点的标签
     labels = [nodes[item[0]]['label'] for item in res]
+    return node_id, majority_label(labels)
+
+
+def majority_label(labels):
+    """
+    多数投票，返回出现次数最多的标签，次数相同时返回最小的标签
+
+    Args:
+        labels: 近邻节点的标签列表
+
+    Returns:
+        预测标签，标签列表为空时返回-1
+    """
     # 动态统计标签，而不是硬编码
-    unique_labels = list(set(labels))
-    stat = {label: labels.count(label) for label in unique_labels}
+    stat = Counter(labels)
 
     # 返回数量最多的标签作为预测结果
     # 遍历统计结果，找到数量最多的标签
     if stat:  # 确保stat不为空
         max_count = max(stat.values())
         # 按标签名称排序以保证一致性
-        sorted_labels = sorted([label for label, count in stat.items() if count == max_count])
-        return node_id, sorted_labels[0]
+        return min(label for label, count in stat.items() if count == max_count)
 
     # 如果没有找到合适的标签，返回默认值-1
-    return node_id, -1
+    return -1
+
+
+class KNNIndex:
+    """
+    可复用的KNN查询索引，一次构建后可对任意节点反复查询
+
+    所有节点的特征保存在一个连续的float64矩阵中，查询时分块计算目标节点与全部节点的
+    均方差距离，再用np.argpartition选出候选，只对候选按(距离, 节点ID)排序，
+    与 knn() 的排序规则和多数投票规则完全一致。
+
+    Args:
+        nodes (dict): 包含所有节点信息的字典，每个节点需要有'feature'和'label'
+        block_size (int): 分块计算距离时每块的节点数
+    """
+
+    def __init__(self, nodes, block_size=BLOCK_SIZE):
+        self.ids = list(nodes.keys())
+        self.labels = [nodes[idx]['label'] for idx in self.ids]
+        # 特征矩阵，形状为(n, d)
+        self.features = np.ascontiguousarray(
+            [nodes[idx]['feature'] for idx in self.ids], dtype=np.float64)
+        self.position = {idx: i for i, idx in enumerate(self.ids)}
+        # 节点ID排序后的名次，用于距离相同时按ID打破平局
+        order = sorted(range(len(self.ids)), key=lambda i: self.ids[i])
+        self.id_rank = np.empty(len(self.ids), dtype=np.int64)
+        self.id_rank[order] = np.arange(len(self.ids))
+        self.block_size = block_size
+        # 每个节点特征的平方和，批量查询时用于展开式计算距离
+        self.sq_norms = np.einsum('ij,ij->i', self.features, self.features)
+
+    def distances(self, feature):
+        """
+        分块计算给定特征与所有节点特征之间的均方差值
+
+        Args:
+            feature: 查询特征向量，长度为d
+
+        Returns:
+            np.ndarray: 与每个节点的距离，形状为(n,)
+        """
+        feature = np.asarray(feature, dtype=np.float64)
+        out = np.empty(len(self.features))
+        for start in range(0, len(out), self.block_size):
+            block = self.features[start:start + self.block_size]
+            out[start:start + self.block_size] = np.mean((block - feature) ** 2, axis=1)
+        return out
+
+    def select(self, dist, k):
+        """
+        从距离数组中选出最近的k个节点，距离相同时ID较小的优先
+
+        Args:
+            dist (np.ndarray): 与每个节点的距离，需要排除的节点置为np.inf
+            k (int): 近邻数量
+
+        Returns:
+            np.ndarray: 最近邻节点在索引中的位置，按(距离, ID)升序排列
+        """
+        k = min(k, int(np.count_nonzero(np.isfinite(dist))))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        # argpartition只保证第k小的值就位，距离等于它的节点都作为候选参与排序
+        kth = dist[np.argpartition(dist, k - 1)[k - 1]]
+        cand = np.flatnonzero(dist <= kth)
+        order = np.lexsort((self.id_rank[cand], dist[cand]))
+        return cand[order[:k]]
+
+    def nearest(self, node_id, k):
+        """
+        查询目标节点的k个最近邻（不包含节点自身）
+
+        Args:
+            node_id: 目标节点的ID
+            k: 近邻数量
+
+        Returns:
+            np.ndarray: 最近邻节点在索引中的位置，按(距离, ID)升序排列
+        """
+        pos = self.position[node_id]
+        dist = self.distances(self.features[pos])
+        # 跳过目标节点本身
+        dist[pos] = np.inf
+        return self.select(dist, k)
+
+    def neighbors(self, node_id, k):
+        """
+        查询目标节点的k个最近邻节点ID
+
+        Args:
+            node_id: 目标节点的ID
+            k: 近邻数量
+
+        Returns:
+            list: 最近邻节点ID列表，按(距离, ID)升序排列
+        """
+        return [self.ids[i] for i in self.nearest(node_id, k)]
+
+    def query(self, node_id, k):
+        """
+        使用K近邻算法预测目标节点的标签，结果与 knn(node_id, nodes, k) 相同
+
+        Args:
+            node_id: 目标节点的ID
+            k: 近邻数量
+
+        Returns:
+            tuple: 包含目标节点ID和预测标签的元组
+        """
+        return node_id, majority_label([self.labels[i] for i in self.nearest(node_id, k)])
+
+    def _resolve_ties(self, dist, q, pos, bound, k, max_memory):
+        """
+        对第k近距离附近存在并列候选的行，只对候选节点按原始公式精确计算距离后排序
+
+        Args:
+            dist (np.ndarray): 这些行的展开式距离，形状为(rows, n)
+            q (np.ndarray): 这些行的查询特征，形状为(rows, d)
+            pos (np.ndarray): 这些行的目标节点位置，形状为(rows,)
+            bound (np.ndarray): 每行候选的距离上界（第k近距离加容差），形状为(rows,)
+            k (int): 近邻数量
+            max_memory (int): 精确计算候选距离时临时数组允许占用的内存上限（字节）
+
+        Returns:
+            np.ndarray: 每行的k个最近邻位置，按(距离, ID)升序排列，形状为(rows, k)
+        """
+        rr, cc = np.nonzero(dist <= bound[:, None])
+        counts = np.bincount(rr, minlength=len(dist))
+        ends = np.cumsum(counts)
+        # 每个候选精确计算时约占2份特征向量的内存
+        limit = max(1, int(max_memory // (2 * 8 * max(1, q.shape[1]))))
+        nearest = np.empty((len(dist), k), dtype=np.int64)
+        r = 0
+        while r < len(dist):
+            if counts[r] > limit:
+                # 并列候选过多的行退回逐行精确计算全部距离
+                d = self.distances(q[r])
+                d[pos[r]] = np.inf
+                nearest[r] = self.select(d, k)
+                r += 1
+                continue
+            # 取连续若干行，使候选总数不超过limit
+            lo, stop = ends[r] - counts[r], r + 1
+            while stop < len(dist) and ends[stop] - lo <= limit:
+                stop += 1
+            hi = ends[stop - 1]
+            rows, cols = rr[lo:hi], cc[lo:hi]
+            exact = np.mean((self.features[cols] - q[rows]) ** 2, axis=1)
+            order = np.lexsort((self.id_rank[cols], exact, rows))
+            # 每行候选按(距离, ID)排序后连续排列，取每行的前k个
+            starts = ends[r:stop] - counts[r:stop] - lo
+            nearest[r:stop] = cols[order][starts[:, None] + np.arange(k)]
+            r = stop
+        return nearest
+
+    def query_batch(self, node_ids=None, k=1, max_memory=MAX_MEMORY):
+        """
+        批量预测多个节点的标签，结果与逐个调用 knn() 相同
+
+        每次取一块查询节点，用 ||q||² - 2q·f + ||f||² 的展开式通过矩阵乘法计算该块与
+        全部节点的均方差距离，块大小由max_memory限制，不会构造N×N的矩阵。
+        第k近距离附近不存在并列候选的行，只对选出的k个近邻按原始公式复核距离后排序；
+        存在并列候选的行，对距离不超过第k近距离加容差的全部候选按原始公式计算距离后排序，
+        只有候选数过多（超出内存上限）的行才退回逐行精确计算。
+
+        Args:
+            node_ids: 需要预测的节点ID列表，为None时预测所有节点
+            k: 近邻数量
+            max_memory (int): 单个距离矩阵块允许占用的内存上限（字节）
+
+        Returns:
+            list: 包含(节点ID, 预测标签)元组的列表，顺序与node_ids一致
+        """
+        if node_ids is None:
+            node_ids = self.ids
+        n = len(self.features)
+        positions = np.array([self.position[idx] for idx in node_ids], dtype=np.int64)
+        k = min(k, n - 1)
+        if k <= 0:
+            return [(idx, -1) for idx in node_ids]
+
+        # 标签编码，编码顺序与标签大小顺序一致，便于向量化多数投票
+        uniq, codes = np.unique(np.asarray(self.labels), return_inverse=True)
+        uniq = uniq.tolist()
+        f_sq_max = self.sq_norms.max()
+        # 距离矩阵及其临时数组约占3份内存
+        rows = max(1, int(max_memory // (3 * 8 * n)))
+        result = []
+        for start in range(0, len(positions), rows):
+            pos = positions[start:start + rows]
+            q = self.features[pos]
+            q_sq = self.sq_norms[pos]
+            # 同一行内 ||q||² 和除以维度都不影响排序，只计算 ||f||² - 2q·f 并原地运算，减少内存读写
+            dist = q @ self.features.T
+            dist *= -2
+            dist += self.sq_norms
+            # 排除目标节点本身
+            local = np.arange(len(pos))
+            dist[local, pos] = np.inf
+
+            part = np.argpartition(dist, k - 1, axis=1)[:, :k]
+            kth = dist[local[:, None], part].max(axis=1)
+            tol = _TIE_RTOL * (q_sq + f_sq_max)
+            tied = np.count_nonzero(dist <= (kth + tol)[:, None], axis=1) > k
+
+            # 没有并列候选的行：前k个近邻的集合已确定，精确计算距离后按(距离, ID)排序
+            exact = np.mean((self.features[part] - q[:, None, :]) ** 2, axis=2)
+            order = np.lexsort((self.id_rank[part], exact), axis=1)
+            nearest = np.take_along_axis(part, order, axis=1)
+            # 存在并列候选的行：在块内对全部候选精确计算距离后排序
+            tied = np.flatnonzero(tied)
+            if len(tied):
+                nearest[tied] = self._resolve_ties(dist[tied], q[tied], pos[tied],
+                                                   (kth + tol)[tied], k, max_memory)
+
+            # 向量化多数投票：票数最多且编码最小（即标签最小）的标签胜出
+            votes = np.zeros((len(pos), len(uniq)), dtype=np.int64)
+            np.add.at(votes, (np.repeat(local, k), codes[nearest].ravel()), 1)
+            winners = np.argmax(votes, axis=1)
+            result.extend((node_ids[start + r], uniq[c]) for r, c in enumerate(winners.tolist()))
+        return result
+
+
+def knn_batch(nodes, k, node_ids=None, max_memory=MAX_MEMORY):
+    """
+    批量使用K近邻算法预测节点标签，结果与逐个调用 knn() 相同
+
+    Args:
+        nodes: 包含所有节点信息的字典
+        k: 近邻数量
+        node_ids: 需要预测的节点ID列表，为None时预测所有节点
+        max_memory (int): 单个距离矩阵块允许占用的内存上限（字节）
+
+    Returns:
+        list: 包含(节点ID, 预测标签)元组的列表
+    """
+    if node_ids is not None:
+        node_ids = list(node_ids)
+    return KNNIndex(nodes).query_batch(node_ids, k, max_memory)
 
 
 def get_feature(one_node, node_dict):
@@ -108,3 +368,198 @@ def get_feature(one_node, node_dict):
 
     # 将独热编码、邻居平均值和节点信息（除第一个元素外）拼接成特征向量
     return one_hot + avg + info[1:]
+
+
+def _round2(values):
+    """
+    向量化地保留两位小数，结果与Python内置round(x, 2)一致
+
+    np.round先乘100再取整，在恰好接近 .5 的位置可能与round()的正确舍入不同，
+    这些位置单独用round()重新计算。
+
+    Args:
+        values (np.ndarray): 需要舍入的数组
+
+    Returns:
+        np.ndarray: 舍入后的数组
+    """
+    out = np.round(values, 2)
+    scaled = values * 100
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for idx in zip(*np.nonzero(near_half)):
+        out[idx] = round(float(values[idx]), 2)
+    return out
+
+
+class GraphFeatures:
+    """
+    批量构建的图节点特征矩阵
+
+    矩阵各行的独热编码位数相同，取所有节点info[0]的最大位数（至少3位），位数较少的节点在高位补0；
+    其余列与 get_feature() 相同。feature() 去掉补齐的高位，返回与 get_feature() 完全相同的向量。
+
+    构建时一次性把节点字典转换为CSR邻接表（indptr, indices）和info矩阵，
+    独热编码用位运算对整列计算，邻居信息之和相当于邻接矩阵乘info列，
+    用按行号分组的np.bincount完成。节点信息或邻居变化时只需重新计算受影响的行。
+
+    Args:
+        node_dict (dict): 包含所有节点信息的字典，每个节点需要有'info'和'neighbors'
+
+    Examples:
+        >>> nodes = {'a': {'info': [9, 1, 2], 'neighbors': ['b']},
+        ...          'b': {'info': [2, 3, 4], 'neighbors': ['a']}}
+        >>> graph = GraphFeatures(nodes)
+        >>> graph.features[1].tolist()
+        [0.0, 0.0, 1.0, 0.0, 9.0, 1.0, 0.0, 0.0, 3.0, 4.0]
+        >>> graph.feature('b').tolist() == get_feature(nodes['b'], nodes)
+        True
+        >>> graph.feature('a').tolist() == get_feature(nodes['a'], nodes)
+        True
+    """
+
+    def __init__(self, node_dict):
+        self.ids = list(node_dict.keys())
+        self.position = {idx: i for i, idx in enumerate(self.ids)}
+        self.info = np.array([node_dict[idx]['info'] for idx in self.ids], dtype=np.float64)
+        self._build_adjacency(node_dict)
+        self._allocate()
+        self._compute(np.arange(len(self.ids)))
+
+    def _build_adjacency(self, node_dict):
+        """
+        将节点字典中的邻居列表转换为CSR格式的邻接表
+
+        Args:
+            node_dict (dict): 包含所有节点信息的字典
+        """
+        lengths = np.array([len(node_dict[idx]['neighbors']) for idx in self.ids], dtype=np.int64)
+        self.indptr = np.zeros(len(self.ids) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.indptr[1:])
+        self.indices = np.fromiter(
+            (self.position[nb] for idx in self.ids for nb in node_dict[idx]['neighbors']),
+            dtype=np.int64, count=int(self.indptr[-1]))
+
+    def _allocate(self):
+        """
+        根据info[0]的最大位数分配特征矩阵
+        """
+        top = int(self.info[:, 0].max()) if len(self.info) else 0
+        # bin(x).zfill(3) 的长度：至少3位
+        self.bits = max(3, top.bit_length())
+        self.features = np.zeros((len(self.ids), self.bits + 4 + self.info.shape[1] - 1))
+
+    def _compute(self, rows):
+        """
+        计算指定行的特征
+
+        Args:
+            rows (np.ndarray): 需要计算的节点位置
+        """
+        # 独热编码：info[0]的二进制位，从高位到低位
+        codes = self.info[rows, 0].astype(np.int64)
+        shifts = np.arange(self.bits - 1, -1, -1)
+        self.features[rows, :self.bits] = (codes[:, None] >> shifts) & 1
+
+        # 收集这些行在CSR中的全部邻居，seg记录每条邻居边属于第几行
+        starts = self.indptr[rows]
+        counts = self.indptr[rows + 1] - starts
+        if np.any(counts == 0):
+            raise ZeroDivisionError(
+                "node %r has no neighbors" % self.ids[int(rows[np.argmin(counts)])])
+        seg = np.repeat(np.arange(len(rows)), counts)
+        offsets = np.arange(len(seg)) - np.repeat(np.cumsum(counts) - counts, counts)
+        neighbors = self.indices[np.repeat(starts, counts) + offsets]
+
+        # 与 get_feature() 保持一致：累加的是邻居info的前 len(info)-1 个元素，最多4个
+        total = np.zeros((len(rows), 4))
+        for j in range(min(self.info.shape[1] - 1, 4)):
+            total[:, j] = np.bincount(seg, weights=self.info[neighbors, j], minlength=len(rows))
+        self.features[rows, self.bits:self.bits + 4] = _round2(total / counts[:, None])
+        self.features[rows, self.bits + 4:] = self.info[rows, 1:]
+
+    def feature(self, node_id):
+        """
+        获取指定节点的特征向量
+
+        Args:
+            node_id: 节点ID
+
+        Returns:
+            np.ndarray: 节点的特征向量，独热编码只保留该节点自身的位数，与 get_feature() 相同
+        """
+        pos = self.position[node_id]
+        # 与 bin(x).zfill(3) 的长度一致：至少3位
+        bits = max(3, int(self.info[pos, 0]).bit_length())
+        return self.features[pos, self.bits - bits:]
+
+    def update(self, node_dict, changed):
+        """
+        节点的信息或邻居发生变化后，只重新计算受影响节点的特征
+
+        受影响的节点包括变化的节点本身，以及邻居中包含变化节点的节点。
+        新出现的节点会追加到特征矩阵末尾。
+
+        Args:
+            node_dict (dict): 更新后的节点字典
+            changed: 信息或邻居列表发生变化（或新增）的节点ID集合
+
+        Returns:
+            list: 重新计算了特征的节点ID列表
+        """
+        changed = list(changed)
+        for idx in changed:
+            if idx not in self.position:
+                self.position[idx] = len(self.ids)
+                self.ids.append(idx)
+        n = len(self.ids)
+        pos = np.array([self.position[idx] for idx in changed], dtype=np.int64)
+
+        # 更新info矩阵
+        if n > len(self.info):
+            self.info = np.vstack([self.info, np.zeros((n - len(self.info), self.info.shape[1]))])
+        if len(pos):
+            self.info[pos] = [node_dict[idx]['info'] for idx in changed]
+
+        # 更新CSR邻接表：删除变化节点原有的邻居，追加新的邻居后按行号重新排列
+        old_rows = np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+        keep = ~np.isin(old_rows, pos)
+        new_rows = np.fromiter(
+            (p for idx, p in zip(changed, pos.tolist()) for _ in node_dict[idx]['neighbors']),
+            dtype=np.int64)
+        new_cols = np.fromiter(
+            (self.position[nb] for idx in changed for nb in node_dict[idx]['neighbors']),
+            dtype=np.int64, count=len(new_rows))
+        rows = np.concatenate([old_rows[keep], new_rows])
+        order = np.argsort(rows, kind='stable')
+        self.indices = np.concatenate([self.indices[keep], new_cols])[order]
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=self.indptr[1:])
+
+        # 独热编码位数变化时需要重新分配并全部重算
+        bits = self.bits
+        if max(3, int(self.info[:, 0].max()).bit_length()) != bits:
+            self._allocate()
+            self._compute(np.arange(n))
+            return list(self.ids)
+        if n > len(self.features):
+            grow = np.zeros((n - len(self.features), self.features.shape[1]))
+            self.features = np.vstack([self.features, grow])
+
+        # 邻居中包含变化节点的行也需要重新计算
+        referrers = np.unique(np.repeat(np.arange(n), np.diff(self.indptr))[np.isin(self.indices, pos)])
+        affected = np.union1d(pos, referrers)
+        self._compute(affected)
+        return [self.ids[i] for i in affected.tolist()]
+
+
+def build_feature_matrix(node_dict):
+    """
+    一次性为所有节点构建特征矩阵，替代逐个节点调用 get_feature()
+
+    Args:
+        node_dict (dict): 包含所有节点信息的字典
+
+    Returns:
+        GraphFeatures: 特征矩阵对象，features属性的第i行对应ids[i]节点的特征（独热编码按最大位数对齐）
+    """
+    return GraphFeatures(node_dict)
@@ -1,5 +1,85 @@
+from collections import deque
+
 import numpy as np
 
+# 流式读取磁盘上的排名向量时每块的元素个数
+CHUNK_SIZE = 1 << 22
+
+
+def top_k(scores, k=None):
+    """
+    选出分数最高的k个元素的索引，分数相同时索引较小的排在前面
+
+    先用np.argpartition在O(n)时间内找到第k大的分数，只对不小于它的候选排序，
+    避免对整个数组做全排序。
+
+    Args:
+        scores (np.ndarray): 分数数组，形状为(n,)
+        k: 选取的数量，为None或不小于n时返回全部元素的排序结果
+
+    Returns:
+        np.ndarray: 按分数降序、索引升序排列的索引数组
+    """
+    scores = np.asarray(scores)
+    n = len(scores)
+    if k is None or k >= n:
+        return np.lexsort((np.arange(n), -scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    # 第k大的分数
+    kth = scores[np.argpartition(scores, n - k)[n - k]]
+    above = np.flatnonzero(scores > kth)
+    # 与第k大分数相同的元素按索引从小到大补足k个
+    ties = np.flatnonzero(scores == kth)[:k - len(above)]
+    cand = np.concatenate([above, ties])
+    return cand[np.lexsort((cand, -scores[cand]))]
+
+
+def iter_rank_chunks(path, chunk_size=CHUNK_SIZE, dtype=np.float64):
+    """
+    以内存映射方式按块读取磁盘上的排名向量
+
+    Args:
+        path (str): 文件路径，.npy文件直接映射，其他文件视为原始二进制
+        chunk_size (int): 每块的元素个数
+        dtype: 原始二进制文件的数据类型
+
+    Yields:
+        np.ndarray: 排名向量的一块
+    """
+    if str(path).endswith('.npy'):
+        data = np.load(path, mmap_mode='r')
+    else:
+        data = np.memmap(path, dtype=dtype, mode='r')
+    for start in range(0, len(data), chunk_size):
+        yield np.asarray(data[start:start + chunk_size])
+
+
+def stream_top_k(chunks, k):
+    """
+    在按块到达的排名向量上维护全局前k名，内存占用只与k和块大小有关
+
+    Args:
+        chunks: 排名向量各块的可迭代对象，按原始顺序排列，例如 iter_rank_chunks(path)
+        k: 选取的数量
+
+    Returns:
+        list: 包含元组的列表，每个元组包含(全局索引, 分数)，按分数降序、索引升序排列
+    """
+    best_idx = np.empty(0, dtype=np.int64)
+    best_scores = np.empty(0)
+    offset = 0
+    for chunk in chunks:
+        chunk = np.asarray(chunk)
+        local = top_k(chunk, k)
+        # 当前前k名与本块前k名合并后重新选取，已有候选的索引都更小，平局时自然排在前面
+        cand_idx = np.concatenate([best_idx, local + offset])
+        cand_scores = np.concatenate([best_scores, chunk[local]])
+        keep = top_k(cand_scores, k)
+        best_idx, best_scores = cand_idx[keep], cand_scores[keep]
+        offset += len(chunk)
+    return list(zip(best_idx.tolist(), best_scores.tolist()))
+
 
 def get_top_k_recommendation(rank_vertor, k=5):
     """
@@ -12,13 +92,8 @@ def get_top_k_recommendation(rank_vertor, k=5):
     Returns:
         list: 包含元组的列表，每个元组包含(索引, 分数)
     """
-    # 对排名向量进行降序排序，获取排序后的索引
-    # np.argsort返回升序排序的索引，[::-1]将其反转为降序
-    sorted_indices = np.argsort(rank_vertor)[::-1]
-
-    # 获取前k个索引
-    # 取排序后索引的前k个元素
-    top_k_indices = sorted_indices[:k]
+    # 选出分数最高的k个索引，按分数降序排列，分数相同时索引小的在前
+    top_k_indices = top_k(rank_vertor, k)
 
     # 获取前k个分数
     # 使用索引数组直接获取对应的分数值
@@ -29,49 +104,572 @@ def get_top_k_recommendation(rank_vertor, k=5):
     return list(zip(top_k_indices, top_k_scores))
 
 
-def page_rank_simple_sorted(alpha, matrix, iterations, k=None):
+class CSRMatrix:
     """
-    简单PageRank算法实现，返回排序后的结果
+    轻量的CSR稀疏矩阵，只支持PageRank迭代需要的矩阵-向量乘法
+
+    属性与scipy.sparse.csr_matrix同名，二者在本模块中可以互换使用。
+
+    Args:
+        indptr (np.ndarray): 行指针，长度为n+1
+        indices (np.ndarray): 每个非零元素的列号
+        data (np.ndarray): 每个非零元素的值
+        shape (tuple): 矩阵形状
+    """
+
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data, dtype=np.float64)
+        self.shape = shape
+        # 每个非零元素所在的行号，矩阵乘法时按行号分组求和
+        self.rows = np.repeat(np.arange(shape[0]), np.diff(self.indptr))
+
+    def __matmul__(self, x):
+        """
+        计算矩阵与向量（或多列向量组成的矩阵）的乘积
+
+        Args:
+            x (np.ndarray): 形状为(n,)的向量或形状为(n, B)的矩阵
+
+        Returns:
+            np.ndarray: 乘积，形状为(n,)或(n, B)
+        """
+        if x.ndim == 1:
+            return np.bincount(self.rows, weights=self.data * x[self.indices], minlength=self.shape[0])
+        # 多列时按行段求和，空行之间没有元素，直接跳过
+        out = np.zeros((self.shape[0], x.shape[1]))
+        nonempty = np.flatnonzero(np.diff(self.indptr))
+        if len(nonempty):
+            contrib = self.data[:, None] * x[self.indices]
+            out[nonempty] = np.add.reduceat(contrib, self.indptr[nonempty], axis=0)
+        return out
+
+
+def edges_to_csr(edges, n=None):
+    """
+    将边列表转换为PageRank使用的CSR转移矩阵
+
+    矩阵按列归一化：M[v, u] = 1 / outdeg(u)，即 rank_new = M @ rank 把u的分数平均分给它指向的节点。
+    没有出边的节点（悬挂节点）对应全零列。
+
+    Args:
+        edges: 有向边(u, v)的可迭代对象，表示u链接到v，节点编号从0开始
+        n: 节点数量，为None时取最大节点编号加一
+
+    Returns:
+        CSRMatrix: 形状为(n, n)的转移矩阵
+    """
+    edges = np.asarray(list(edges) if not isinstance(edges, np.ndarray) else edges,
+                       dtype=np.int64).reshape(-1, 2)
+    src, dst = edges[:, 0], edges[:, 1]
+    if n is None:
+        n = int(edges.max()) + 1 if len(edges) else 0
+    out_degree = np.bincount(src, minlength=n)
+    # 按目标节点排序得到CSR的行
+    order = np.argsort(dst, kind='stable')
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(dst, minlength=n), out=indptr[1:])
+    data = 1.0 / out_degree[src[order]]
+    return CSRMatrix(indptr, src[order], data, (n, n))
+
+
+def _as_transition(matrix):
+    """
+    将输入统一为支持 @ 运算的转移矩阵
+
+    Args:
+        matrix: 稠密ndarray、scipy.sparse矩阵、CSRMatrix，或者有向边列表
+
+    Returns:
+        转移矩阵，稠密ndarray、CSR格式的稀疏矩阵或CSRMatrix
+    """
+    if not hasattr(matrix, 'shape'):
+        # 没有shape属性的输入视为边列表
+        return edges_to_csr(matrix)
+    if hasattr(matrix, 'tocsr'):
+        return matrix.tocsr()
+    return matrix
+
+
+def _dangling_nodes(matrix):
+    """
+    找出转移矩阵中的悬挂节点（对应列全为零）
+
+    Args:
+        matrix: 转移矩阵
+
+    Returns:
+        np.ndarray: 悬挂节点的索引
+    """
+    n = matrix.shape[1]
+    if hasattr(matrix, 'indptr'):
+        col_sums = np.bincount(matrix.indices, weights=np.abs(matrix.data), minlength=n)
+    else:
+        col_sums = np.abs(np.asarray(matrix)).sum(axis=0)
+    return np.flatnonzero(col_sums == 0)
+
+
+def page_rank(alpha, matrix, max_iter, tol=None):
+    """
+    幂迭代计算PageRank值，支持稠密矩阵、CSR稀疏矩阵和边列表
+
+    悬挂节点的分数按均匀分布重新分给所有节点，保证每轮迭代分数总和不变。
 
     Args:
         alpha: 阻尼因子，通常取值0.85左右
-        matrix: 链接关系转移矩阵
-        iterations: 迭代次数
-        k: 返回前k个结果，如果为None则返回全部结果
+        matrix: 链接关系转移矩阵（稠密ndarray、scipy.sparse矩阵或CSRMatrix），或者有向边列表
+        max_iter: 最大迭代次数
+        tol: 收敛阈值，相邻两轮PageRank值的L1残差小于tol时提前结束，为None时跑满max_iter轮
 
     Returns:
-        tuple: 包含排序后索引和对应分数的元组
+        tuple: (PageRank值, 实际迭代次数, 最后一轮的L1残差)
     """
-    # 获取网页数量
-    # matrix.shape[0]返回矩阵的第一维度大小，即行数（网页数量）
+    matrix = _as_transition(matrix)
     n = matrix.shape[0]
+    dangling = _dangling_nodes(matrix)
 
     # 初始化PageRank值，均匀分布
-    # np.ones(n)创建一个包含n个1的数组，除以n得到均匀分布的初始值
     rank = np.ones(n) / n
-
-    # 进行多次迭代计算PageRank值
-    # 迭代iterations次，逐步优化PageRank值
-    for _ in range(iterations):
+    residual = float('inf')
+    iterations = 0
+    while iterations < max_iter:
         # PageRank核心公式: PR = α * M * PR + (1-α) / N
-        # 这是PageRank算法的矩阵形式：
-        # - M是转移概率矩阵
-        # - PR是当前PageRank值向量
-        # - α是阻尼因子（通常为0.85）
-        # - (1-α)/N是随机跳转部分
-        # - @表示矩阵乘法
-        rank = alpha * matrix @ rank + (1 - alpha) / n
-
-    # 对最终的PageRank值进行降序排序
+        new_rank = alpha * (matrix @ rank) + (1 - alpha) / n
+        if len(dangling):
+            # 悬挂节点的分数均匀分给所有节点
+            new_rank += alpha * rank[dangling].sum() / n
+        residual = float(np.abs(new_rank - rank).sum())
+        rank = new_rank
+        iterations += 1
+        if tol is not None and residual < tol:
+            break
+    return rank, iterations, residual
+
+
+def _teleport_matrix(n, seeds):
+    """
+    构造个性化PageRank的跳转矩阵，每列在对应种子集合上均匀分布
+
+    Args:
+        n (int): 节点数量
+        seeds: 种子集合列表，每个元素是一组节点索引
+
+    Returns:
+        np.ndarray: 跳转矩阵，形状为(n, B)
+    """
+    teleport = np.zeros((n, len(seeds)))
+    for col, seed in enumerate(seeds):
+        seed = np.unique(np.asarray(list(seed), dtype=np.int64))
+        teleport[seed, col] = 1.0 / len(seed)
+    return teleport
+
+
+def personalized_page_rank(alpha, matrix, seeds, max_iter=100, tol=1e-10):
+    """
+    批量计算多个种子集合的个性化PageRank
+
+    每个种子集合对应n×B排名矩阵的一列，所有列在同一轮迭代中通过一次矩阵乘法一起更新：
+    R = α * (M @ R + 悬挂节点分数 * T) + (1-α) * T，其中T为跳转矩阵，
+    悬挂节点的分数跳回各自的种子集合。
+
+    Args:
+        alpha: 阻尼因子，通常取值0.85左右
+        matrix: 链接关系转移矩阵（稠密ndarray、scipy.sparse矩阵或CSRMatrix），或者有向边列表
+        seeds: 种子集合列表，每个元素是一组节点索引
+        max_iter: 最大迭代次数
+        tol: 收敛阈值，所有列相邻两轮的L1残差都小于tol时提前结束，为None时跑满max_iter轮
+
+    Returns:
+        tuple: (排名矩阵(n, B), 实际迭代次数, 最后一轮各列L1残差中的最大值)
+    """
+    matrix = _as_transition(matrix)
+    n = matrix.shape[0]
+    dangling = _dangling_nodes(matrix)
+    teleport = _teleport_matrix(n, seeds)
+
+    rank = teleport.copy()
+    residual = float('inf')
+    iterations = 0
+    while iterations < max_iter:
+        new_rank = alpha * (matrix @ rank) + (1 - alpha) * teleport
+        if len(dangling):
+            new_rank += alpha * rank[dangling].sum(axis=0) * teleport
+        residual = float(np.abs(new_rank - rank).sum(axis=0).max())
+        rank = new_rank
+        iterations += 1
+        if tol is not None and residual < tol:
+            break
+    return rank, iterations, residual
+
+
+def _out_links(matrix):
+    """
+    将转移矩阵按列（出链）重新组织，得到每个节点的出链目标及转移概率
+
+    Args:
+        matrix: 转移矩阵
+
+    Returns:
+        tuple: (out_indptr, targets, weights)，节点u的出链为targets[out_indptr[u]:out_indptr[u + 1]]
+    """
+    if hasattr(matrix, 'indptr'):
+        rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+        cols, data = np.asarray(matrix.indices), np.asarray(matrix.data, dtype=np.float64)
+    else:
+        dense = np.asarray(matrix)
+        rows, cols = np.nonzero(dense)
+        data = dense[rows, cols]
+    order = np.argsort(cols, kind='stable')
+    out_indptr = np.zeros(matrix.shape[1] + 1, dtype=np.int64)
+    np.cumsum(np.bincount(cols, minlength=matrix.shape[1]), out=out_indptr[1:])
+    return out_indptr, rows[order], data[order]
+
+
+def approximate_ppr(alpha, matrix, seed, eps=1e-6, out_links=None):
+    """
+    使用前向推送（forward push）近似计算单个种子集合的个性化PageRank
+
+    每个节点维护估计值p和残差r，残差超过 eps * 出度 的节点把 (1-α) 的残差留给自己，
+    其余 α 的残差按转移概率推给出链邻居（悬挂节点推回种子集合）。
+    只会访问种子附近残差足够大的节点，不需要遍历整张图。
+
+    Args:
+        alpha: 阻尼因子
+        matrix: 转移矩阵（稠密ndarray、scipy.sparse矩阵或CSRMatrix），或者有向边列表
+        seed: 种子节点索引集合
+        eps: 推送阈值，越小越精确
+        out_links: 预先计算好的 _out_links(matrix) 结果，批量调用时可复用
+
+    Returns:
+        dict: 节点索引到近似个性化PageRank值的映射，只包含被访问到的节点
+    """
+    if out_links is None:
+        out_links = _out_links(_as_transition(matrix))
+    out_indptr, targets, weights = out_links
+    seed = sorted(set(seed))
+    estimate = {}
+    residual = {s: 1.0 / len(seed) for s in seed}
+    queue = deque(seed)
+    queued = set(seed)
+    while queue:
+        u = queue.popleft()
+        queued.discard(u)
+        ru = residual.pop(u, 0.0)
+        estimate[u] = estimate.get(u, 0.0) + (1 - alpha) * ru
+        start, stop = out_indptr[u], out_indptr[u + 1]
+        if start == stop:
+            # 悬挂节点的分数跳回种子集合
+            nbrs, share = seed, [alpha * ru / len(seed)] * len(seed)
+        else:
+            nbrs, share = targets[start:stop].tolist(), (alpha * ru * weights[start:stop]).tolist()
+        for v, s in zip(nbrs, share):
+            rv = residual.get(v, 0.0) + s
+            residual[v] = rv
+            if v not in queued and rv > eps * max(out_indptr[v + 1] - out_indptr[v], 1):
+                queue.append(v)
+                queued.add(v)
+    return estimate
+
+
+def personalized_recommendations(alpha, matrix, seeds, k=5, mode='power', max_iter=100,
+                                 tol=1e-10, eps=1e-6):
+    """
+    为多个种子集合（例如每个用户的历史节点）批量生成前k个个性化推荐
+
+    Args:
+        alpha: 阻尼因子
+        matrix: 转移矩阵（稠密ndarray、scipy.sparse矩阵或CSRMatrix），或者有向边列表
+        seeds: 种子集合列表
+        k: 每个种子集合返回的推荐数量
+        mode: 'power' 表示在n×B排名矩阵上批量幂迭代，'push' 表示逐个种子集合做局部前向推送
+        max_iter: 幂迭代的最大迭代次数
+        tol: 幂迭代的收敛阈值
+        eps: 前向推送的阈值
+
+    Returns:
+        list: 每个种子集合对应一个 get_top_k_recommendation 格式的(索引, 分数)列表
+    """
+    matrix = _as_transition(matrix)
+    if mode == 'power':
+        rank, _, _ = personalized_page_rank(alpha, matrix, seeds, max_iter, tol)
+        return [get_top_k_recommendation(rank[:, col], k) for col in range(rank.shape[1])]
+    if mode != 'push':
+        raise ValueError("mode must be 'power' or 'push'")
+    out_links = _out_links(matrix)
+    result = []
+    for seed in seeds:
+        estimate = approximate_ppr(alpha, matrix, seed, eps, out_links)
+        nodes = np.fromiter(estimate.keys(), dtype=np.int64, count=len(estimate))
+        scores = np.fromiter(estimate.values(), dtype=np.float64, count=len(estimate))
+        # 按节点编号排序后复用前k名选取，平局时仍按全局节点编号从小到大
+        order = np.argsort(nodes)
+        nodes, scores = nodes[order], scores[order]
+        picked = top_k(scores, k)
+        result.append(list(zip(nodes[picked], scores[picked])))
+    return result
+
+
+def page_rank_simple_sorted(alpha, matrix, iterations, k=None, tol=None, return_info=False):
+    """
+    简单PageRank算法实现，返回排序后的结果
+
+    Args:
+        alpha: 阻尼因子，通常取值0.85左右
+        matrix: 链接关系转移矩阵，可以是稠密ndarray、scipy.sparse矩阵、CSRMatrix，或者有向边列表
+        iterations: 最大迭代次数
+        k: 返回前k个结果，如果为None则返回全部结果
+        tol: 收敛阈值，L1残差小于tol时提前结束，为None时固定迭代iterations次
+        return_info: 是否额外返回实际迭代次数和最后一轮的L1残差
+
+    Returns:
+        tuple: 包含排序后索引和对应分数的元组；return_info为True时为
+            (排序后索引, 对应分数, 实际迭代次数, L1残差)
+    """
+    rank, used, residual = page_rank(alpha, matrix, iterations, tol)
     # 获取按PageRank值降序排列的索引
-    sorted_indices = np.argsort(rank)[::-1]
+    # 如果指定了k且k小于网页总数，则只选取前k个结果，否则返回所有结果
+    sorted_indices = top_k(rank, k)
     # 根据排序索引获取对应的PageRank值
     sorted_scores = rank[sorted_indices]
 
-    # 根据k值决定返回多少个结果
-    if k is not None and k < n:
-        # 如果指定了k且k小于网页总数，则返回前k个结果
-        return sorted_indices[:k], sorted_scores[:k]
-    else:
-        # 否则返回所有结果
-        return sorted_indices, sorted_scores
+    if return_info:
+        return sorted_indices, sorted_scores, used, residual
+    return sorted_indices, sorted_scores
+
+
+class IncrementalPageRank:
+    """
+    支持边增删和新增节点的增量PageRank
+
+    维护估计值p、局部残差r和一个作用于所有节点的均匀残差g，满足不变式
+    r + g = b - (I - αP) p，其中 b = (1-α)/n，P为含悬挂节点均匀跳转的转移矩阵。
+    某个节点u的出链变化时 P 只有第u列改变，残差只需在u的新旧出链上修正 α * p[u] * ΔP[:, u]；
+    之后按Gauss-Southwell方式只推送残差超过阈值的节点，不需要从均匀分布重新迭代。
+    悬挂节点推给所有节点的份额累积在g中，由于 (I-αP)^{-1} g = g·n/(1-α) · PageRank，
+    读取结果时用 p / (1 - g·n/(1-α)) 一次性修正。
+
+    Args:
+        alpha: 阻尼因子，通常取值0.85左右
+        edges: 初始有向边(u, v)列表，节点编号从0开始
+        n: 初始节点数量，为None时取最大节点编号加一
+        rank: 上一次计算得到的PageRank向量，作为热启动的初值；为None时先用幂迭代求解
+        eps: 推送阈值，局部残差绝对值不超过eps的节点不再推送
+        max_iter: 冷启动时幂迭代的最大迭代次数
+    """
+
+    def __init__(self, alpha, edges=(), n=None, rank=None, eps=1e-10, max_iter=100):
+        edges = [(int(u), int(v)) for u, v in edges]
+        if n is None:
+            n = max((max(u, v) for u, v in edges), default=-1) + 1
+        self.alpha = alpha
+        self.eps = eps
+        self.n = n
+        # 每个节点的出链列表，允许重边，与 edges_to_csr 的语义一致
+        self.out = [[] for _ in range(n)]
+        for u, v in edges:
+            self.out[u].append(v)
+        capacity = max(n, 1)
+        self._p = np.zeros(capacity)
+        self._r = np.zeros(capacity)
+        self._g = 0.0
+        # 悬挂节点上估计值之和，新增节点时用于计算均匀残差的变化
+        self._dangling = 0.0
+        self._queue = deque()
+        self._queued = set()
+        if n == 0:
+            return
+
+        matrix = edges_to_csr(edges, n)
+        if rank is None:
+            rank, _, _ = page_rank(alpha, matrix, max_iter, eps)
+        self._p[:n] = rank
+        # 按不变式计算初值对应的残差
+        dangling = _dangling_nodes(matrix)
+        self._dangling = float(self._p[dangling].sum())
+        spread = alpha * self._dangling / n
+        self._r[:n] = (1 - alpha) / n + alpha * (matrix @ self._p[:n]) + spread - self._p[:n]
+        for u in np.flatnonzero(np.abs(self._r[:n]) > eps).tolist():
+            self._enqueue(u)
+        self._propagate()
+
+    def _enqueue(self, u):
+        """
+        残差超过阈值的节点加入推送队列
+
+        Args:
+            u (int): 节点编号
+        """
+        if u not in self._queued and abs(self._r[u]) > self.eps:
+            self._queue.append(u)
+            self._queued.add(u)
+
+    def _propagate(self):
+        """
+        不断推送队列中节点的残差，直到所有局部残差都不超过阈值
+        """
+        alpha, eps, p, r, out = self.alpha, self.eps, self._p, self._r, self.out
+        queue, queued = self._queue, self._queued
+        while queue:
+            u = queue.popleft()
+            queued.discard(u)
+            ru = float(r[u])
+            r[u] = 0.0
+            p[u] += ru
+            links = out[u]
+            if not links:
+                # 悬挂节点均匀推给所有节点
+                self._g += alpha * ru / self.n
+                self._dangling += ru
+                continue
+            share = alpha * ru / len(links)
+            for v in links:
+                rv = r[v] + share
+                r[v] = rv
+                # 与 _enqueue 相同的判断，内联以减少函数调用
+                if (rv > eps or rv < -eps) and v not in queued:
+                    queue.append(v)
+                    queued.add(v)
+
+    def _grow(self, n):
+        """
+        扩展到n个节点，新节点没有出链，数组容量不足时按倍数扩容
+
+        新节点使 b 从 (1-α)/n_old 变为 (1-α)/n，悬挂节点的均匀跳转也摊到更多节点上，
+        旧节点上的残差变化是均匀的，直接计入g；新节点的残差单独设置。
+
+        Args:
+            n (int): 新的节点数量
+        """
+        old = self.n
+        if n <= old:
+            return
+        if n > len(self._p):
+            capacity = max(n, 2 * len(self._p))
+            self._p = np.concatenate([self._p, np.zeros(capacity - len(self._p))])
+            self._r = np.concatenate([self._r, np.zeros(capacity - len(self._r))])
+        self.out.extend([] for _ in range(n - old))
+        self.n = n
+        alpha = self.alpha
+        mass = (1 - alpha) + alpha * self._dangling
+        if old:
+            self._g += mass * (1.0 / n - 1.0 / old)
+        for u in range(old, n):
+            self._r[u] = mass / n - self._g
+            self._p[u] = 0.0
+            # 新节点本身是悬挂节点，它的残差 r + g 要与旧节点保持一致
+            self._enqueue(u)
+
+    def _relink(self, u, targets):
+        """
+        将节点u的出链替换为targets，并按 α * p[u] * ΔP[:, u] 修正残差
+
+        Args:
+            u (int): 出链发生变化的节点
+            targets (list): 新的出链列表
+        """
+        alpha, p, r = self.alpha, self._p, self._r
+        mass = alpha * p[u]
+        old = self.out[u]
+        if old:
+            for v in old:
+                r[v] -= mass / len(old)
+        else:
+            self._g -= mass / self.n
+            # 失去悬挂节点身份
+            self._dangling -= p[u]
+        if targets:
+            for v in targets:
+                r[v] += mass / len(targets)
+        else:
+            self._g += mass / self.n
+            self._dangling += p[u]
+        self.out[u] = targets
+        for v in set(old) | set(targets):
+            self._enqueue(v)
+
+    def add_vertex(self):
+        """
+        新增一个没有出链的节点
+
+        Returns:
+            int: 新节点的编号
+        """
+        self._grow(self.n + 1)
+        self._propagate()
+        return self.n - 1
+
+    def update(self, added=(), removed=()):
+        """
+        批量应用边的增删，然后统一推送残差
+
+        Args:
+            added: 新增的有向边(u, v)列表，节点编号超出范围时自动新增节点
+            removed: 删除的有向边(u, v)列表
+
+        Returns:
+            np.ndarray: 更新后的PageRank向量
+        """
+        added = [(int(u), int(v)) for u, v in added]
+        removed = [(int(u), int(v)) for u, v in removed]
+        top = max((max(u, v) for u, v in added), default=-1) + 1
+        self._grow(top)
+        changed = {}
+        for u, v in removed:
+            targets = changed.setdefault(u, list(self.out[u]))
+            targets.remove(v)
+        for u, v in added:
+            changed.setdefault(u, list(self.out[u])).append(v)
+        for u, targets in changed.items():
+            self._relink(u, targets)
+        self._propagate()
+        return self.rank
+
+    def add_edge(self, u, v):
+        """
+        新增一条有向边u->v
+
+        Args:
+            u: 源节点
+            v: 目标节点
+
+        Returns:
+            np.ndarray: 更新后的PageRank向量
+        """
+        return self.update(added=[(u, v)])
+
+    def remove_edge(self, u, v):
+        """
+        删除一条有向边u->v
+
+        Args:
+            u: 源节点
+            v: 目标节点
+
+        Returns:
+            np.ndarray: 更新后的PageRank向量
+        """
+        return self.update(removed=[(u, v)])
+
+    @property
+    def rank(self):
+        """
+        当前的PageRank向量
+
+        Returns:
+            np.ndarray: 形状为(n,)的PageRank向量
+        """
+        gamma = self._g * self.n / (1 - self.alpha)
+        return self._p[:self.n] / (1 - gamma)
+
+    def top_k(self, k=5):
+        """
+        获取当前PageRank前k名
+
+        Args:
+            k: 返回的数量
+
+        Returns:
+            list: 包含元组的列表，每个元组包含(索引, 分数)
+        """
+        return get_top_k_recommendation(self.rank, k)
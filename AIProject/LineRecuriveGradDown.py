@@ -1,5 +1,9 @@
+import os
+
 import numpy as np
 
+from LinearRegression import solve_linear_regression
+
 
 def cal_grad(n, train_data, y, learning_rate, w0, m):
     """
@@ -25,7 +29,8 @@ def cal_grad(n, train_data, y, learning_rate, w0, m):
     return gradient
 
 
-def func(n, m, p, learning_rate, K, w0, train_data, test_data, y):
+def func(n, m, p, learning_rate, K, w0, train_data, test_data, y, solver='gd', tol=None,
+         n_jobs=None):
     """
     执行线性回归梯度下降算法并进行预测
     
@@ -39,14 +44,119 @@ def func(n, m, p, learning_rate, K, w0, train_data, test_data, y):
         train_data: 训练数据集，形状为(m, n)
         test_data: 测试数据集，形状为(p, n)
         y: 训练标签，形状为(m,)
-        
+        solver: 求解器，'gd'、'normal'、'qr'或'lbfgs'，见 LinearRegression.solve_linear_regression
+        tol: 梯度范数小于tol时提前停止迭代，为None时跑满K次
+        n_jobs: 按行分片到多个进程并行计算梯度所需的 XᵀX 和 Xᵀy，为None时使用CPU核数，为1时单进程
+
     Returns:
         list: 测试集预测结果列表
     """
-    # 执行K次梯度下降迭代
-    for _ in range(K):
-        grad = cal_grad(n, train_data, y, learning_rate, w0, m)
-        w0 -= grad
+    # 执行至多K次梯度下降迭代（或使用指定的求解器一次求解）
+    w = solve_linear_regression(train_data, y, w0, learning_rate, K, solver, tol, n_jobs)
+    if isinstance(w0, np.ndarray):
+        # 与原先原地更新w0的行为保持一致
+        w0[...] = w
+    else:
+        w0 = w
     # 使用训练好的模型对测试集进行预测
     py = np.dot(test_data, w0)
     return py.tolist()
+
+
+def inverse_decay(learning_rate, decay):
+    """
+    构造随步数衰减的学习率：lr_t = learning_rate / (1 + decay * t)
+
+    Args:
+        learning_rate: 初始学习率
+        decay: 衰减系数
+
+    Returns:
+        function: 输入步数t，返回该步的学习率
+    """
+    return lambda t: learning_rate / (1 + decay * t)
+
+
+def _save_checkpoint(path, w, epoch, block, batch, step):
+    """
+    原子地保存训练检查点：先写临时文件，再替换目标文件
+
+    Args:
+        path: 检查点文件路径
+        w: 当前权重向量
+        epoch: 当前轮次
+        block: 当前轮次中已处理到的数据块序号
+        batch: 当前数据块中已处理的小批量数
+        step: 累计更新步数
+    """
+    tmp = str(path) + '.tmp'
+    with open(tmp, 'wb') as f:
+        np.savez(f, w=w, epoch=epoch, block=block, batch=batch, step=step)
+    os.replace(tmp, path)
+
+
+def sgd_stream(source, n, learning_rate=0.01, batch_size=256, epochs=1, shuffle=True,
+               block_size=65536, seed=0, w0=None, checkpoint=None, checkpoint_every=1000):
+    """
+    流式小批量随机梯度下降，训练数据不需要一次性读入内存
+
+    数据按块读取，打乱时每轮随机排列数据块的顺序，再在块内随机排列行，
+    每个小批量使用 cal_grad 的梯度公式更新权重。
+    指定checkpoint时定期保存权重和训练进度，重启后从检查点继续训练；
+    打乱顺序由seed、轮次和块序号确定，恢复后与中断前的顺序一致。
+
+    Args:
+        source: 训练数据来源。可以是形状为(rows, n+1)的ndarray或np.memmap，
+            每行前n列为特征、最后一列为标签（与线性回归的输入格式一致）；
+            也可以是可调用对象，输入轮次，返回该轮的(x, y)数据块迭代器
+        n: 特征数量
+        learning_rate: 学习率，可以是常数，也可以是输入步数返回学习率的函数（如 inverse_decay）
+        batch_size: 小批量的样本数
+        epochs: 训练轮数
+        shuffle: 是否打乱数据
+        block_size: source为数组时每块的行数
+        seed: 打乱顺序使用的随机种子
+        w0: 初始权重向量，为None时全零
+        checkpoint: 检查点文件路径，为None时不保存
+        checkpoint_every: 每隔多少步保存一次检查点
+
+    Returns:
+        np.ndarray: 训练后的权重向量，形状为(n,)
+    """
+    schedule = learning_rate if callable(learning_rate) else (lambda t: learning_rate)
+    w = np.zeros(n) if w0 is None else np.array(w0, dtype=np.float64)
+    start_epoch = start_block = start_batch = step = 0
+    if checkpoint is not None and os.path.exists(checkpoint):
+        with np.load(checkpoint) as state:
+            w = state['w'].copy()
+            start_epoch, start_block = int(state['epoch']), int(state['block'])
+            start_batch, step = int(state['batch']), int(state['step'])
+
+    for epoch in range(start_epoch, epochs):
+        if callable(source):
+            blocks = source(epoch)
+        else:
+            starts = np.arange(0, len(source), block_size)
+            if shuffle:
+                # 按块打乱顺序，只需要随机访问块的起始位置
+                starts = np.random.default_rng([seed, epoch]).permutation(starts)
+            blocks = ((source[s:s + block_size, :n], source[s:s + block_size, n]) for s in starts)
+
+        for b, (x, y) in enumerate(blocks):
+            if epoch == start_epoch and b < start_block:
+                continue
+            x = np.asarray(x, dtype=np.float64)
+            y = np.asarray(y, dtype=np.float64)
+            if shuffle:
+                order = np.random.default_rng([seed, epoch, b]).permutation(len(x))
+                x, y = x[order], y[order]
+            first = start_batch if (epoch == start_epoch and b == start_block) else 0
+            for k, i in enumerate(range(first * batch_size, len(x), batch_size), start=first):
+                xb, yb = x[i:i + batch_size], y[i:i + batch_size]
+                w -= cal_grad(n, xb, yb, schedule(step), w, len(xb))
+                step += 1
+                if checkpoint is not None and step % checkpoint_every == 0:
+                    _save_checkpoint(checkpoint, w, epoch, b, k + 1, step)
+        if checkpoint is not None:
+            _save_checkpoint(checkpoint, w, epoch + 1, 0, 0, step)
+    return w
@@ -1,84 +1,300 @@
+import os  # 获取CPU核数
+from concurrent.futures import ProcessPoolExecutor  # 多进程并行计算 XᵀX
+from multiprocessing import shared_memory  # 进程间共享训练数据，避免序列化
+
 import numpy as np
 
+from InputLoader import open_input, read_array, read_line
+
+# 支持的求解器
+SOLVERS = ('gd', 'normal', 'qr', 'lbfgs')
+
+# 工作进程中挂载的共享内存及训练数据视图
+_SHARED = {}
 
-def linear_regression():
+
+def linear_regression(solver='gd', tol=None):
     """
-    实现线性回归算法，使用梯度下降法训练模型并进行预测
-    
+    实现线性回归算法，使用梯度下降法（或其他求解器）训练模型并进行预测
+
+    Args:
+        solver (str): 求解器，见 solve_linear_regression
+        tol (float): 梯度范数小于tol时提前停止迭代，为None时不提前停止
+
     Returns:
         np.ndarray: 测试集的预测结果，保留两位小数
     """
+    stream = open_input()
     # 读取模型参数
     # 从标准输入读取一行，包含5个浮点数参数
     # m: 训练样本数, n: 特征数, p: 测试样本数, alpha: 学习率, K: 迭代次数
-    m, n, p, alpha, K = map(float, input().strip().split())
-    # 将前4个参数转换为整数（样本数应为整数）
-    m, n, p, K = int(m), int(n), int(p), int(n)
+    m, n, p, alpha, K = read_line(stream).tolist()
+    # 将前4个参数转换为整数（样本数和迭代次数应为整数）
+    m, n, p, K = int(m), int(n), int(p), int(K)
 
     # 读取初始权重
     # 读取n个初始权重值，这些是模型参数的初始猜测值
-    w_init = list(map(float, input().strip().split()))
-    # 将权重列表转换为numpy数组便于进行向量化计算
-    w = np.array(w_init)
+    w = read_line(stream)
 
-    # 读取训练数据
+    # 整块读取训练数据和测试数据，直接解析为numpy数组
+    data = read_array(stream, m * (n + 1) + p * n)
+    # 训练数据每行包含n个特征和1个标签
     # x_train: 训练特征矩阵 (m×n), y_train: 训练标签向量 (m×1)
-    x_train, y_train = [], []
-    # 循环读取m个训练样本
-    for _ in range(m):
-        # 读取一行数据，包含n个特征和1个标签
-        data = list(map(float, input().strip().split()))
-        # 前n个元素为特征值（输入变量）
-        x_train.append(data[:-1])
-        # 最后一个元素为标签值（目标变量）
-        y_train.append(data[-1])
-    # 转换为numpy数组以利用向量化运算
-    x_train, y_train = np.array(x_train), np.array(y_train)
+    train = data[:m * (n + 1)].reshape(m, n + 1)
+    x_train, y_train = train[:, :-1], train[:, -1]
 
     # 读取测试数据
-    # x_test: 测试特征矩阵 (p×n)
-    x_test = []
-    # 循环读取p个测试样本
-    for _ in range(p):
-        # 读取一行测试数据，包含n个特征（没有标签）
-        data = list(map(float, input().strip().split()))
-        x_test.append(data)
-    # 转换为numpy数组
-    x_test = np.array(x_test)
-
-    # 使用梯度下降法训练模型
-    # 进行K次迭代优化，逐步改进模型参数
-    for k in range(K):
-        # 计算预测值: y_hat = X * w
-        # 这是线性回归的核心公式，X是训练特征矩阵，w是权重向量
-        # np.dot执行矩阵乘法，结果是形状为(m,)的向量
-        y_hat = np.dot(x_train, w)
-
-        # 计算预测误差: error = y_hat - y_train
-        # 即预测值与真实值的差值，也称为残差
-        # 这个向量表示每个训练样本的预测偏差
-        error = y_hat - y_train
-
-        # 计算梯度: gradient = (2/m) * X^T * error
-        # 这是均方误差损失函数对权重的偏导数
-        # 推导过程：
-        # 1. 损失函数: L = (1/m) * Σ(y_hat - y_train)²
-        # 2. 对权重w求偏导: ∂L/∂w = (2/m) * X^T * (y_hat - y_train)
-        # 3. 即: ∂L/∂w = (2/m) * X^T * error
-        # x_train.T是x_train的转置，形状从(m,n)变为(n,m)
-        # 结果gradient是一个形状为(n,)的向量，表示每个权重的梯度
-        gradient = 2 / m * np.dot(x_train.T, error)
+    # x_test: 测试特征矩阵 (p×n)，每行包含n个特征（没有标签）
+    x_test = data[m * (n + 1):].reshape(p, n)
+
+    # 使用梯度下降法（或指定的求解器）训练模型
+    w = solve_linear_regression(x_train, y_train, w, alpha, K, solver, tol)
 
+    # 对测试集进行预测并返回结果
+    # 使用训练好的权重对测试集进行预测: y_test = X_test * w
+    # x_test形状为(p,n)，w形状为(n,)，结果为形状(p,)的向量
+    # 结果保留两位小数
+    return np.round(np.dot(x_test, w), 2)
+
+
+def _init_worker(name, shape, dtype):
+    """
+    工作进程初始化：挂载父进程创建的共享内存，并构造训练数据视图
+
+    Args:
+        name (str): 共享内存名称
+        shape (tuple): 训练数据数组形状，每行为n个特征加1个标签
+        dtype (str): 训练数据数组类型
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    _SHARED['shm'] = shm
+    _SHARED['data'] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _partial_gram(start, stop):
+    """
+    计算一个行分片的 AᵀA，A为特征和标签拼成的增广矩阵 [X y]
+
+    Args:
+        start (int): 分片起始行
+        stop (int): 分片结束行（不含）
+
+    Returns:
+        np.ndarray: 形状为(n+1, n+1)，左上角为该分片的XᵀX，最后一列为Xᵀy
+    """
+    shard = _SHARED['data'][start:stop]
+    return shard.T @ shard
+
+
+def _parallel_gram(x_train, y_train, n_jobs):
+    """
+    按行把训练数据分片到多个进程，并行计算 XᵀX 和 Xᵀy 后求和
+
+    训练数据放在共享内存中，每个进程只读取自己分片的行，返回(n+1)×(n+1)的部分和。
+
+    Args:
+        x_train (np.ndarray): 训练特征矩阵，形状为(m, n)
+        y_train (np.ndarray): 训练标签向量，形状为(m,)
+        n_jobs (int): 进程数
+
+    Returns:
+        tuple: (XᵀX, Xᵀy)
+    """
+    m, n = x_train.shape
+    shape = (m, n + 1)
+    shm = shared_memory.SharedMemory(create=True, size=max(m * (n + 1) * 8, 1))
+    try:
+        data = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        data[:, :n] = x_train
+        data[:, n] = y_train
+        bounds = np.linspace(0, m, n_jobs + 1).astype(int)
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                 initargs=(shm.name, shape, data.dtype.str)) as pool:
+            total = sum(pool.map(_partial_gram, bounds[:-1], bounds[1:]))
+        del data
+    finally:
+        shm.close()
+        shm.unlink()
+    return total[:n, :n], total[:n, n]
+
+
+def _gradient_descent(gram, xty, w, m, alpha, K, tol):
+    """
+    使用预先计算的 XᵀX 和 Xᵀy 做批量梯度下降
+
+    Args:
+        gram (np.ndarray): XᵀX，形状为(n, n)
+        xty (np.ndarray): Xᵀy，形状为(n,)
+        w (np.ndarray): 初始权重，形状为(n,)
+        m (int): 训练样本数
+        alpha (float): 学习率
+        K (int): 最大迭代次数
+        tol (float): 梯度范数小于tol时提前停止，为None时跑满K次
+
+    Returns:
+        np.ndarray: 训练后的权重
+    """
+    for _ in range(K):
+        # 计算梯度: gradient = (2/m) * X^T * (X * w - y) = (2/m) * (X^T X * w - X^T y)
+        # 这是均方误差损失函数 L = (1/m) * Σ(y_hat - y_train)² 对权重的偏导数
+        # X^T X 和 X^T y 只在训练开始前计算一次，每次迭代的代价为O(n²)而不是O(mn)
+        gradient = 2 / m * (gram @ w - xty)
+        if tol is not None and np.linalg.norm(gradient) < tol:
+            break
         # 更新权重: w = w - alpha * gradient
         # 沿着梯度的反方向更新权重，alpha是学习率
         # 学习率控制每次更新的步长：
         # - 太大可能导致震荡或不收敛
         # - 太小可能导致收敛速度过慢
-        # 这是梯度下降法的核心更新规则
         w = w - alpha * gradient
+    return w
 
-    # 对测试集进行预测并返回结果
-    # 使用训练好的权重对测试集进行预测: y_test = X_test * w
-    # x_test形状为(p,n)，w形状为(n,)，结果为形状(p,)的向量
-    # 结果保留两位小数
-    return round(np.dot(x_test, w), 2)
+
+def _lbfgs(gram, xty, w, m, K, tol, history=10):
+    """
+    使用L-BFGS最小化均方误差
+
+    损失函数是二次函数，Hessian为 (2/m) * XᵀX，每一步沿搜索方向做精确线搜索。
+
+    Args:
+        gram (np.ndarray): XᵀX，形状为(n, n)
+        xty (np.ndarray): Xᵀy，形状为(n,)
+        w (np.ndarray): 初始权重，形状为(n,)
+        m (int): 训练样本数
+        K (int): 最大迭代次数
+        tol (float): 梯度范数小于tol时提前停止，为None时只在无法继续下降时停止
+        history (int): 保存的曲率对数量
+
+    Returns:
+        np.ndarray: 训练后的权重
+    """
+    hessian = 2 / m * gram
+    gradient = hessian @ w - 2 / m * xty
+    s_list, y_list = [], []
+    for _ in range(K):
+        if tol is not None and np.linalg.norm(gradient) < tol:
+            break
+        # 双循环递推计算搜索方向 d = -H⁻¹g
+        q = gradient.copy()
+        coefs = []
+        for s, y in zip(reversed(s_list), reversed(y_list)):
+            rho = 1.0 / (y @ s)
+            a = rho * (s @ q)
+            q -= a * y
+            coefs.append((rho, a))
+        if s_list:
+            q *= (s_list[-1] @ y_list[-1]) / (y_list[-1] @ y_list[-1])
+        for (s, y), (rho, a) in zip(zip(s_list, y_list), reversed(coefs)):
+            q += (a - rho * (y @ q)) * s
+        direction = -q
+
+        curvature = direction @ hessian @ direction
+        if curvature <= 0:
+            break
+        step = -(gradient @ direction) / curvature
+        s = step * direction
+        new_gradient = gradient + hessian @ s
+        y = new_gradient - gradient
+        w = w + s
+        gradient = new_gradient
+        if y @ s > 0:
+            s_list.append(s)
+            y_list.append(y)
+            if len(s_list) > history:
+                s_list.pop(0)
+                y_list.pop(0)
+    return w
+
+
+def _solve_triangular(a, b, lower=False):
+    """
+    回代求解三角方程组 a x = b
+
+    Args:
+        a (np.ndarray): 上三角或下三角矩阵，形状为(n, n)，对角线非零
+        b (np.ndarray): 右端向量，形状为(n,)
+        lower (bool): a是否为下三角矩阵
+
+    Returns:
+        np.ndarray: 解向量，形状为(n,)
+    """
+    n = len(b)
+    x = np.zeros(n)
+    for i in (range(n) if lower else range(n - 1, -1, -1)):
+        # 已求出的分量在x中，未求出的分量为0，不影响点积
+        x[i] = (b[i] - a[i] @ x) / a[i, i]
+    return x
+
+
+def _rank_deficient(diag, rtol):
+    """
+    根据三角因子的对角线判断矩阵是否（数值上）列不满秩
+
+    Args:
+        diag (np.ndarray): 三角因子的对角线
+        rtol (float): 相对阈值，对角元绝对值不超过 rtol * 最大对角元绝对值时视为零
+
+    Returns:
+        bool: 是否列不满秩
+    """
+    diag = np.abs(diag)
+    return len(diag) > 0 and bool(np.any(diag <= rtol * diag.max()))
+
+
+def solve_linear_regression(x_train, y_train, w, alpha, K, solver='gd', tol=None, n_jobs=None):
+    """
+    求解线性回归权重
+
+    Args:
+        x_train (np.ndarray): 训练特征矩阵，形状为(m, n)
+        y_train (np.ndarray): 训练标签向量，形状为(m,)
+        w (np.ndarray): 初始权重，形状为(n,)，'normal'和'qr'求解器不使用
+        alpha (float): 学习率，只有'gd'使用
+        K (int): 最大迭代次数，'gd'和'lbfgs'使用
+        solver (str): 求解器
+            - 'gd': 批量梯度下降，预先计算 XᵀX 和 Xᵀy，每步代价O(n²)
+            - 'normal': 对正规方程 XᵀX w = Xᵀy 做Cholesky分解，一次求解
+            - 'qr': 对X做QR分解后求解 R w = Qᵀy，数值上比正规方程更稳定
+            - 'lbfgs': L-BFGS拟牛顿法，配合精确线搜索
+        tol (float): 梯度范数小于tol时提前停止迭代，为None时不提前停止
+        n_jobs (int): 并行计算 XᵀX 和 Xᵀy 的进程数，为None时使用CPU核数，为1时单进程计算；
+            'qr'求解器总是单进程
+
+    Returns:
+        np.ndarray: 训练后的权重，形状为(n,)
+    """
+    if solver not in SOLVERS:
+        raise ValueError("solver must be one of %s" % (SOLVERS,))
+    x_train = np.asarray(x_train, dtype=np.float64)
+    y_train = np.asarray(y_train, dtype=np.float64)
+    w = np.asarray(w, dtype=np.float64)
+    m = len(x_train)
+
+    # 与 np.linalg.lstsq 默认的截断阈值一致
+    rtol = max(x_train.shape) * np.finfo(np.float64).eps
+    if solver == 'qr':
+        q, r = np.linalg.qr(x_train)
+        if len(x_train) < x_train.shape[1] or _rank_deficient(np.diag(r), rtol):
+            # X列不满秩时R近似奇异，退回最小二乘解
+            return np.linalg.lstsq(x_train, y_train, rcond=None)[0]
+        return _solve_triangular(r, q.T @ y_train)
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs > 1:
+        gram, xty = _parallel_gram(x_train, y_train, n_jobs)
+    else:
+        gram = x_train.T @ x_train
+        xty = x_train.T @ y_train
+    if solver == 'gd':
+        return _gradient_descent(gram, xty, w, m, alpha, K, tol)
+    if solver == 'lbfgs':
+        return _lbfgs(gram, xty, w, m, K, tol)
+    try:
+        lower = np.linalg.cholesky(gram)
+    except np.linalg.LinAlgError:
+        lower = None
+    # XᵀX 的条件数是X的平方，L的对角线对应R的对角线，阈值相应取平方根
+    if lower is None or _rank_deficient(np.diag(lower), np.sqrt(rtol)):
+        # XᵀX不正定或近似奇异时退回最小二乘解
+        return np.linalg.lstsq(x_train, y_train, rcond=None)[0]
+    return _solve_triangular(lower.T, _solve_triangular(lower, xty, lower=True))
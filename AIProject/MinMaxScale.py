@@ -1,14 +1,27 @@
+import math  # 计算分块长度和截断项数
+from collections import deque  # 滑动窗口内的单调队列
+
+import numpy as np
+
+# 分块递推时块内缩放因子 beta**(-j) 的上界，限制数值误差的放大倍数
+_SCALE = 1024.0
+# 衰减快到 beta**k 小于该值时直接截断为有限项求和
+_EPS = 1e-17
+# 截断求和允许的最大项数，超过时改用分块递推
+_FIR_TERMS = 64
+
+
 def min_max_value(xi, x_min, x_max):
     """
     对单个值进行最小-最大归一化
 
     Args:
-        xi: 需要归一化的值
+        xi: 需要归一化的值，可以是标量或ndarray
         x_min: 数据集中的最小值
         x_max: 数据集中的最大值
 
     Returns:
-        float: 归一化后的值，范围在[0,1]之间
+        float: 归一化后的值，范围在[0,1]之间；输入为数组时按元素计算
     """
     # 使用最小-最大归一化公式: (xi - min) / (max - min)
     # 将数据缩放到[0,1]区间内
@@ -20,16 +33,67 @@ def min_max_scale(traffic_matrix):
     对整个数据集进行最小-最大归一化
 
     Args:
-        traffic_matrix: 原始数据列表
+        traffic_matrix: 原始数据列表，或形状为(links, d)的二维数组，每行一条序列
 
     Returns:
-        list: 归一化后的数据列表
+        list: 归一化后的数据列表；输入为二维时返回每行分别归一化的ndarray
     """
-    # 找到数据集中的最小值和最大值
-    x_min = min(traffic_matrix)
-    x_max = max(traffic_matrix)
+    x = np.asarray(traffic_matrix, dtype=np.float64)
+    # 找到每条序列的最小值和最大值
+    x_min = x.min(axis=-1, keepdims=True)
+    x_max = x.max(axis=-1, keepdims=True)
     # 对数据集中的每个值都进行归一化处理
-    return [min_max_value(xi, x_min, x_max) for xi in traffic_matrix]
+    y = min_max_value(x, x_min, x_max)
+    return y.tolist() if y.ndim == 1 else y
+
+
+def _linear_recurrence(u, beta):
+    """
+    沿最后一维计算一阶线性递推 y[t] = beta * y[t-1] + u[t]，y[-1] = 0
+
+    展开后 y[t] = beta**t * Σ u[i] * beta**(-i)，直接用累加和计算时 beta**(-i) 会溢出。
+    这里把序列切成长度为L的块，块内的 beta**(-j) 不超过_SCALE，一次累加和得到每块从零开始的递推值；
+    各块末尾的真实值满足同样形式的递推，系数为 beta**L（约为1/_SCALE），
+    衰减很快，用有限项移位求和即可算出，再加回到块内各位置。
+
+    Args:
+        u: 输入数组，形状为(..., d)
+        beta: 衰减系数，取值在[0, 1]之间
+
+    Returns:
+        np.ndarray: 递推结果，与u同形状
+    """
+    u = np.asarray(u, dtype=np.float64)
+    d = u.shape[-1]
+    if beta == 0 or d <= 1:
+        return u.copy()
+
+    terms = math.ceil(math.log(_EPS) / math.log(beta)) if beta < 1 else math.inf
+    if terms <= _FIR_TERMS:
+        # 衰减很快：beta**terms 已经可以忽略，y[t] = Σ_{k<terms} beta**k * u[t-k]
+        y = u.copy()
+        power = 1.0
+        for k in range(1, min(terms, d)):
+            power *= beta
+            y[..., k:] += power * u[..., :-k]
+        return y
+
+    size = max(1, int(math.log(_SCALE) / -math.log(beta))) if beta < 1 else d
+    # 块长不超过序列长度，短序列不需要补齐到整块
+    size = min(size, d)
+    n_blocks = -(-d // size)
+    blocks = np.zeros(u.shape[:-1] + (n_blocks * size,))
+    blocks[..., :d] = u
+    blocks = blocks.reshape(u.shape[:-1] + (n_blocks, size))
+    powers = beta ** np.arange(size)
+    # 块内从零开始的递推值
+    local = np.cumsum(blocks / powers, axis=-1) * powers
+    # 每块末尾的真实值，再取上一块的末尾值作为本块的初始状态
+    ends = _linear_recurrence(local[..., -1], beta ** size)
+    carry = np.zeros_like(ends)
+    carry[..., 1:] = ends[..., :-1]
+    y = local + (powers * beta) * carry[..., None]
+    return y.reshape(u.shape[:-1] + (n_blocks * size,))[..., :d]
 
 
 def process(traffic_matrix, alpha, adjust):
@@ -37,61 +101,178 @@ def process(traffic_matrix, alpha, adjust):
     处理交通流量数据，使用指数加权移动平均或简单指数平滑
 
     Args:
-        traffic_matrix: 原始交通流量数据列表
+        traffic_matrix: 原始交通流量数据列表，或形状为(links, d)的二维数组，每行一条序列
         alpha: 学习率参数，控制平滑程度
         adjust: 是否使用调整模式的标志
 
     Returns:
-        list: 处理后的数据列表
+        list: 处理后的数据列表；输入为二维时返回ndarray，每行分别处理
     """
     # 先对原始数据进行归一化处理
     # 调用min_max_scale函数将数据缩放到[0,1]区间
-    x = min_max_scale(traffic_matrix)
-    # 初始化结果列表，用于存储平滑后的数据
-    y = []
+    x = np.asarray(min_max_scale(traffic_matrix), dtype=np.float64)
 
     # 计算衰减因子，alpha = 1 - learning_rate
     # 这个值决定了历史数据的衰减速度
     one_alpha = 1 - alpha
     # 获取数据长度
-    d = len(x)
+    d = x.shape[-1]
 
     # 根据adjust参数选择不同的平滑算法
     if adjust:
         # 使用调整模式计算指数加权移动平均
-        # 这种方法给予近期数据更高的权重
-        # 初始化分子和分母的累积值
-        numerator_sum = 0
-        denominator_sum = 0
-
-        # 从最早的数据开始处理（从索引0到 d-1）
-        for i in range(d):
-            # 计算分子部分：数据值 * 衰减因子的幂次
-            # 幂次越大（越早期的数据）权重越小
-            # (d - i - 1)表示距离当前时刻的步数，越早期步数越大
-            numerator_sum += x[i] * one_alpha ** (d - i - 1)
-            # 计算分母部分：衰减因子的幂次之和
-            denominator_sum += one_alpha ** (d - i - 1)
-            # 计算加权平均值
-            # 通过分子除以分母得到当前时刻的加权平均值
-            yi = numerator_sum / denominator_sum
-            # 将结果添加到列表中
-            y.append(yi)
-
+        # 第t个输出为 Σ_{i<=t} x[i] * (1-α)**(d-i-1) / Σ_{i<=t} (1-α)**(d-i-1)，
+        # 分子分母同时约去 (1-α)**(d-t-1) 后，
+        # 分子满足递推 num[t] = (1-α) * num[t-1] + x[t]，
+        # 分母为等比数列求和 Σ_{k<=t} (1-α)**k
+        numerator = _linear_recurrence(x, one_alpha)
+        k = np.arange(1, d + 1)
+        if alpha == 0:
+            denominator = k.astype(np.float64)
+        elif alpha == 1:
+            denominator = np.ones(d)
+        else:
+            # (1 - (1-α)**k) / α，α很小时用expm1和log1p避免相减抵消
+            denominator = -np.expm1(k * np.log1p(-alpha)) / alpha
+        y = numerator / denominator
     else:
-        # 使用简单指数平滑算法
-        # 这是一种递推算法，当前值依赖于前一个平滑值
-        for i in range(d):
-            if i == 0:
-                # 第一个值直接使用原始数据
-                # 对于第一个数据点，没有历史信息可以参考
-                yi = x[i]
-            else:
-                # 使用指数平滑公式: yt = α * xt + (1-α) * yt-1
-                # 其中α是learning_rate，yt-1是上一个平滑值
-                # 这个公式给当前值分配权重α，给历史值分配权重(1-α)
-                yi = alpha * x[i] + one_alpha * y[i - 1]
-            # 将结果添加到列表中
-            y.append(yi)
+        # 使用简单指数平滑算法: yt = α * xt + (1-α) * yt-1
+        # 第一个值直接使用原始数据，写成递推 y[t] = (1-α) * y[t-1] + u[t]，
+        # 其中 u[0] = x[0]，u[t] = α * x[t]
+        u = alpha * x
+        u[..., :1] = x[..., :1]
+        y = _linear_recurrence(u, one_alpha)
     # 返回处理后的数据
-    return y
+    return y.tolist() if y.ndim == 1 else y
+
+
+class StreamingScaler:
+    """
+    流式最小-最大归一化加指数加权移动平均
+
+    逐个值或按小批量输入数据，维护原始数据的EWMA和（全局或滑动窗口内的）最小值、最大值，
+    每个输出在产生时用当时的最小值、最大值归一化。
+    归一化是线性变换，EWMA的权重之和为1，所以先平滑再归一化与 process 中先归一化再平滑结果相同：
+    输入完整序列后最后一个输出与 process 的最后一个值一致；
+    保留 update(..., raw=True) 返回的原始EWMA，最后调用 scale 即可得到与 process 完全相同的序列。
+    """
+
+    def __init__(self, alpha, adjust, window=None):
+        """
+        初始化流式算子
+
+        Args:
+            alpha: 学习率参数，控制平滑程度
+            adjust: 是否使用调整模式
+            window: 最小值、最大值的滑动窗口长度，为None时使用全部历史数据
+        """
+        self.alpha = alpha
+        self.adjust = adjust
+        self.window = window
+        self.count = 0
+        # 调整模式下EWMA的分子和分母，非调整模式下只用numerator保存上一个平滑值
+        self.numerator = 0.0
+        self.denominator = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        # 单调队列中保存(序号, 值)，_min_q递增，_max_q递减
+        self._min_q = deque()
+        self._max_q = deque()
+
+    def _smooth(self, x):
+        """
+        计算一批新数据的原始EWMA，并更新内部状态
+
+        Args:
+            x: 新数据，形状为(b,)
+
+        Returns:
+            np.ndarray: 每个位置的原始EWMA
+        """
+        beta = 1 - self.alpha
+        if self.adjust:
+            u = x.copy()
+            u[0] += beta * self.numerator
+            numerator = _linear_recurrence(u, beta)
+            ones = np.ones_like(x)
+            ones[0] += beta * self.denominator
+            denominator = _linear_recurrence(ones, beta)
+            self.numerator, self.denominator = numerator[-1], denominator[-1]
+            return numerator / denominator
+        u = self.alpha * x
+        # 序列的第一个值直接作为平滑值，之后 y[t] = α * x[t] + (1-α) * y[t-1]
+        u[0] = x[0] if self.count == 0 else u[0] + beta * self.numerator
+        y = _linear_recurrence(u, beta)
+        self.numerator = y[-1]
+        return y
+
+    def _extremes(self, x):
+        """
+        计算每个新数据到达时的最小值和最大值，并更新内部状态
+
+        Args:
+            x: 新数据，形状为(b,)
+
+        Returns:
+            tuple: (每个位置的最小值, 每个位置的最大值)
+        """
+        if self.window is None:
+            lows = np.minimum.accumulate(np.append(self.min, x))[1:]
+            highs = np.maximum.accumulate(np.append(self.max, x))[1:]
+            self.min, self.max = lows[-1], highs[-1]
+            return lows, highs
+
+        lows = np.empty_like(x)
+        highs = np.empty_like(x)
+        for j, v in enumerate(x.tolist()):
+            i = self.count + j
+            # 弹出不可能再成为最小值（最大值）的元素，每个元素最多进出队列一次
+            while self._min_q and self._min_q[-1][1] >= v:
+                self._min_q.pop()
+            self._min_q.append((i, v))
+            while self._max_q and self._max_q[-1][1] <= v:
+                self._max_q.pop()
+            self._max_q.append((i, v))
+            # 移除滑出窗口的元素
+            if self._min_q[0][0] <= i - self.window:
+                self._min_q.popleft()
+            if self._max_q[0][0] <= i - self.window:
+                self._max_q.popleft()
+            lows[j], highs[j] = self._min_q[0][1], self._max_q[0][1]
+        self.min, self.max = self._min_q[0][1], self._max_q[0][1]
+        return lows, highs
+
+    def update(self, values, raw=False):
+        """
+        输入一个值或一批值，返回对应的平滑结果
+
+        Args:
+            values: 单个数值或一维数组
+            raw: 为True时返回未归一化的原始EWMA
+
+        Returns:
+            float或np.ndarray: 与输入形状对应的输出；
+                归一化时使用每个值到达时的最小值和最大值，最大值等于最小值时为nan
+        """
+        x = np.atleast_1d(np.asarray(values, dtype=np.float64))
+        if len(x) == 0:
+            return x
+        lows, highs = self._extremes(x)
+        y = self._smooth(x)
+        self.count += len(x)
+        if not raw:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                y = min_max_value(y, lows, highs)
+        return y if np.ndim(values) else float(y[0])
+
+    def scale(self, raw):
+        """
+        使用当前的最小值和最大值归一化原始EWMA
+
+        Args:
+            raw: update(..., raw=True) 返回的原始EWMA
+
+        Returns:
+            float或np.ndarray: 归一化后的值
+        """
+        return min_max_value(np.asarray(raw, dtype=np.float64), self.min, self.max)
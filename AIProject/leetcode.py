@@ -1,3 +1,9 @@
+import operator
+from array import array
+
+import numpy as np
+
+
 def bs(a, t):
     """
     在有序数组中使用二分查找寻找目标值的索引。
@@ -21,92 +27,304 @@ def bs(a, t):
     return -1
 
 
-class SegT:
+class LazySegTree:
     """
-    线段树类，支持区间更新和单点查询操作。
+    非递归（自底向上）的懒惰标记线段树，支持区间修改、区间查询和单点读写。
+
+    节点值构成幺半群 (op, e)，修改操作 (mapping, composition, id_) 作用在节点值上；
+    mapping 额外接收节点覆盖的区间长度，使区间加配合区间和等依赖长度的组合也能正确下传。
+    节点值等于子树合并结果再作用上本节点尚未下传的懒惰标记。
+    节点值和懒惰标记在 tc 不为 None 时存放在 array(tc) 中（如 'q' 为64位整数），否则存放在列表中。
 
     属性:
         n (int): 原始数组长度。
-        sz (int): 线段树大小（2的幂）。
-        d (any): 默认值。
-        f (function): 合并子节点值的函数，默认为 min。
-        t (list): 线段树节点值。
-        lz (list): 懒惰标记数组。
+        lg (int): 树高，sz = 2 ** lg。
+        sz (int): 叶子层大小（2的幂）。
+        t (array | list): 线段树节点值，叶子从下标 sz 开始。
+        lz (array | list): 内部节点的懒惰标记。
     """
 
-    def __init__(self, a, d=10 ** 18, f=min):
+    def __init__(self, a, op, e, mapping, composition, id_, tc='q', commutative=False):
         """
         初始化线段树。
 
         参数:
-            a (list): 初始数组。
-            d (any): 默认值。
-            f (function): 合并函数。
+            a (list | np.ndarray): 初始数组。
+            op (function): 合并两个节点值的函数，满足结合律；为 numpy 通用函数（如 np.minimum）时批量建树。
+            e (any): op 的单位元。
+            mapping (function): mapping(f, x, ln) 返回把修改 f 作用到长度为 ln、值为 x 的节点后的值。
+            composition (function): composition(f, g) 返回先做 g 再做 f 的复合修改。
+            id_ (any): 恒等修改。
+            tc (str): array 的类型码，为 None 时使用列表存储任意对象。
+            commutative (bool): 修改之间可交换且 mapping 对 op 满足分配律（如区间加配合 min/max/和）时为 True，
+                区间更新和单点查询不再下传懒惰标记，改为在祖先节点上累积。
         """
         self.n = len(a)
-        self.sz = 1
-        while self.sz < self.n: self.sz *= 2
-        self.d, self.f = d, f
-        self.t = [0] * (2 * self.sz)
-        self.lz = [0] * (2 * self.sz)
-        for i, v in enumerate(a): self.t[self.sz + i] = v
-        for i in range(self.sz - 1, 0, -1): self.t[i] = f(self.t[2 * i], self.t[2 * i + 1])
+        self.commutative = commutative
+        self.lg = max(0, (self.n - 1).bit_length())
+        self.sz = 1 << self.lg
+        self.op, self.e, self.mapping, self.composition, self.id = op, e, mapping, composition, id_
+        self.tc = tc
+        self.t = array(tc, [e]) * (2 * self.sz) if tc else [e] * (2 * self.sz)
+        self.lz = array(tc, [id_]) * self.sz if tc else [id_] * self.sz
+        self.build(a)
+
+    def build(self, a):
+        """
+        用数组批量重建整棵树，清空所有懒惰标记。
 
-    def push(self, i):
+        参数:
+            a (list | np.ndarray): 新数组，长度必须等于 n。
+        """
+        sz, n, t, op = self.sz, self.n, self.t, self.op
+        if len(a) != n: raise ValueError("length of a must be %d" % n)
+        for i in range(sz): self.lz[i] = self.id
+        for i in range(sz + n, 2 * sz): t[i] = self.e
+        if self.tc:
+            # 通过缓冲区直接写入叶子，不逐个装箱
+            view = np.frombuffer(t, dtype=np.dtype(self.tc))
+            view[sz:sz + n] = np.asarray(a)
+            if isinstance(op, np.ufunc):
+                # 逐层向上批量合并
+                lo = sz // 2
+                while lo:
+                    view[lo:2 * lo] = op(view[2 * lo:4 * lo:2], view[2 * lo + 1:4 * lo:2])
+                    lo //= 2
+                return
+        else:
+            t[sz:sz + n] = list(a)
+        for i in range(sz - 1, 0, -1): t[i] = op(t[2 * i], t[2 * i + 1])
+
+    def _apply(self, k, f):
+        """
+        把修改 f 作用到节点 k 上，内部节点同时记录懒惰标记。
+
+        参数:
+            k (int): 节点索引。
+            f (any): 修改。
+        """
+        self.t[k] = self.mapping(f, self.t[k], self.sz >> (k.bit_length() - 1))
+        if k < self.sz: self.lz[k] = self.composition(f, self.lz[k])
+
+    def push(self, k):
         """
         将懒惰标记下传给子节点。
 
         参数:
-            i (int): 当前节点索引。
+            k (int): 当前节点索引。
+        """
+        f = self.lz[k]
+        if f != self.id:
+            self._apply(2 * k, f)
+            self._apply(2 * k + 1, f)
+            self.lz[k] = self.id
+
+    def _push_bounds(self, l, r):
+        """
+        从根到叶下传区间 [l, r)（已加上 sz）两端路径上的懒惰标记。
+
+        参数:
+            l (int): 左端点对应的叶子索引。
+            r (int): 右端点对应的叶子索引。
+        """
+        t, lz, sz, ident = self.t, self.lz, self.sz, self.id
+        mapping, composition = self.mapping, self.composition
+        ln = sz
+        for i in range(self.lg, 0, -1):
+            # 第 i 层节点的子节点覆盖长度为 2 ** (i - 1)
+            ln >>= 1
+            mask = (1 << i) - 1
+            # 端点恰好落在第 i 层节点边界上时，该节点不跨越端点，无需下传
+            k = l >> i
+            if l & mask and lz[k] != ident:
+                f, c = lz[k], 2 * k
+                t[c] = mapping(f, t[c], ln)
+                t[c + 1] = mapping(f, t[c + 1], ln)
+                if c < sz:
+                    lz[c] = composition(f, lz[c])
+                    lz[c + 1] = composition(f, lz[c + 1])
+                lz[k] = ident
+            k = (r - 1) >> i
+            if r & mask and lz[k] != ident:
+                f, c = lz[k], 2 * k
+                t[c] = mapping(f, t[c], ln)
+                t[c + 1] = mapping(f, t[c + 1], ln)
+                if c < sz:
+                    lz[c] = composition(f, lz[c])
+                    lz[c + 1] = composition(f, lz[c + 1])
+                lz[k] = ident
+
+    def get(self, p):
+        """
+        查询某个位置的值。
+
+        参数:
+            p (int): 查询的位置。
+
+        返回:
+            any: 该位置的值。
+        """
+        p += self.sz
+        if not self.commutative:
+            self._push_bounds(p, p + 1)
+            return self.t[p]
+        # 不下传，自底向上依次作用祖先节点上的懒惰标记
+        lz, mapping, ident = self.lz, self.mapping, self.id
+        x = self.t[p]
+        p >>= 1
+        while p:
+            if lz[p] != ident: x = mapping(lz[p], x, 1)
+            p >>= 1
+        return x
+
+    def set(self, p, x):
         """
-        if self.lz[i]:
-            for c in (2 * i, 2 * i + 1):
-                self.t[c] += self.lz[i]
-                self.lz[c] += self.lz[i]
-            self.lz[i] = 0
+        修改某个位置的值。
 
-    def upd(self, l, r, v, i=1, il=0, ir=None):
+        参数:
+            p (int): 修改的位置。
+            x (any): 新的值。
+        """
+        p += self.sz
+        self._push_bounds(p, p + 1)
+        t, op = self.t, self.op
+        t[p] = x
+        for i in range(1, self.lg + 1):
+            k = p >> i
+            t[k] = op(t[2 * k], t[2 * k + 1])
+
+    def prod(self, l, r):
         """
-        区间更新操作。
+        区间查询操作，返回 op(a[l], ..., a[r-1])。
+
+        参数:
+            l (int): 查询区间的左端点。
+            r (int): 查询区间的右端点（不含）。
+
+        返回:
+            any: 区间合并结果，空区间返回 e。
+        """
+        if l >= r: return self.e
+        l += self.sz
+        r += self.sz
+        self._push_bounds(l, r)
+        t, op = self.t, self.op
+        sml = smr = self.e
+        while l < r:
+            if l & 1:
+                sml = op(sml, t[l])
+                l += 1
+            if r & 1:
+                r -= 1
+                smr = op(t[r], smr)
+            l >>= 1
+            r >>= 1
+        return op(sml, smr)
+
+    def all_prod(self):
+        """
+        查询整个数组的合并结果。
+
+        返回:
+            any: op(a[0], ..., a[n-1])。
+        """
+        return self.t[1]
+
+    def apply(self, l, r, f):
+        """
+        区间更新操作，把修改 f 作用到 a[l], ..., a[r-1] 上。
 
         参数:
             l (int): 更新区间的左端点。
-            r (int): 更新区间的右端点。
+            r (int): 更新区间的右端点（不含）。
+            f (any): 修改。
+        """
+        if l >= r: return
+        l += self.sz
+        r += self.sz
+        if not self.commutative: self._push_bounds(l, r)
+        t, lz, op, sz, ident = self.t, self.lz, self.op, self.sz, self.id
+        mapping, composition = self.mapping, self.composition
+        l2, r2, ln = l, r, 1
+        while l < r:
+            if l & 1:
+                t[l] = mapping(f, t[l], ln)
+                if l < sz: lz[l] = composition(f, lz[l])
+                l += 1
+            if r & 1:
+                r -= 1
+                t[r] = mapping(f, t[r], ln)
+                if r < sz: lz[r] = composition(f, lz[r])
+            l >>= 1
+            r >>= 1
+            ln <<= 1
+        # 自底向上重新合并两端路径上的节点，第 i 层节点覆盖长度为 2 ** i
+        # 没有下传时，节点自身的懒惰标记仍需作用在重新合并的值上
+        for i in range(1, self.lg + 1):
+            mask = (1 << i) - 1
+            if l2 & mask:
+                k = l2 >> i
+                t[k] = op(t[2 * k], t[2 * k + 1])
+                if lz[k] != ident: t[k] = mapping(lz[k], t[k], mask + 1)
+            if r2 & mask:
+                k = (r2 - 1) >> i
+                t[k] = op(t[2 * k], t[2 * k + 1])
+                if lz[k] != ident: t[k] = mapping(lz[k], t[k], mask + 1)
+
+
+class SegT(LazySegTree):
+    """
+    线段树类，支持区间加法更新、单点查询和区间查询操作，基于 LazySegTree 实现。
+
+    属性:
+        n (int): 原始数组长度。
+        sz (int): 线段树大小（2的幂）。
+        d (any): 默认值，f 为 min 时作为单位元，f 为 max 时取其相反数。
+        f (function): 合并子节点值的函数，默认为 min；为 operator.add 时维护区间和。
+        t (array | list): 线段树节点值。
+        lz (array | list): 懒惰标记数组。
+    """
+
+    def __init__(self, a, d=10 ** 18, f=min, tc=None):
+        """
+        初始化线段树。
+
+        参数:
+            a (list): 初始数组。
+            d (any): 默认值。
+            f (function): 合并函数。
+            tc (str): array 的类型码，为 None 时使用列表存储（Python 整数不会溢出）。
+        """
+        if f is operator.add:
+            # 区间加对区间和的贡献与区间长度成正比
+            e, mapping = 0, lambda v, x, ln: x + v * ln
+        else:
+            e, mapping = (-d if f is max else d), lambda v, x, ln: x + v
+        super().__init__(a, f, e, mapping, operator.add, 0, tc, commutative=True)
+        self.d, self.f = d, f
+
+    def upd(self, l, r, v):
+        """
+        区间更新操作，区间 [l, r) 内的每个值加上 v。
+
+        参数:
+            l (int): 更新区间的左端点。
+            r (int): 更新区间的右端点（不含）。
             v (any): 更新的值。
-            i (int): 当前节点索引。
-            il (int): 当前区间的左边界。
-            ir (int): 当前区间的右边界。
-        """
-        if ir is None: ir = self.sz
-        if r <= il or ir <= l: return
-        if l <= il and ir <= r:
-            self.t[i] += v;
-            self.lz[i] += v;
-            return
-        self.push(i)
-        m = (il + ir) // 2
-        self.upd(l, r, v, 2 * i, il, m)
-        self.upd(l, r, v, 2 * i + 1, m, ir)
-        self.t[i] = self.f(self.t[2 * i], self.t[2 * i + 1])
-
-    def qry(self, p, i=1, il=0, ir=None):
+        """
+        self.apply(l, r, v)
+
+    def qry(self, p):
         """
         查询某个位置的值。
 
         参数:
             p (int): 查询的位置。
-            i (int): 当前节点索引。
-            il (int): 当前区间的左边界。
-            ir (int): 当前区间的右边界。
 
         返回:
             any: 该位置的值。
         """
-        if ir is None: ir = self.sz
-        if ir - il == 1: return self.t[i]
-        self.push(i)
-        m = (il + ir) // 2
-        return self.qry(p, 2 * i, il, m) if p < m else self.qry(p, 2 * i + 1, m, ir)
+        return self.get(p)
 
 
 class Fenw:
@@ -199,6 +417,17 @@ class DSU:
         self.p = [-1] * n
         self.c = n
 
+    def add(self):
+        """
+        新增一个单独成集合的元素，用于事先不知道元素总数的场景。
+
+        返回:
+            int: 新元素的索引。
+        """
+        self.p.append(-1)
+        self.c += 1
+        return len(self.p) - 1
+
     def find(self, x):
         """
         查找元素所属集合的根节点，并进行路径压缩优化。
@@ -2,6 +2,8 @@ from collections import defaultdict
 
 import numpy as np
 
+from InputLoader import open_input, read_line, read_matrix
+
 
 def input_data():
     """
@@ -10,12 +12,10 @@ def input_data():
     Returns:
         np.ndarray: 用户输入的数据，转换为numpy数组格式
     """
-    n = int(input())
-    data = []
-    # 读取n行数据并转换为整数列表
-    for _ in range(n):
-        data.append(list(map(int, input().strip().split())))
-    return np.array(data)
+    stream = open_input()
+    n = int(read_line(stream, np.int64)[0])
+    # 整块读取n行数据并解析为整数矩阵
+    return read_matrix(stream, n, np.int64)
 
 
 def linear_regression():